@@ -5,7 +5,11 @@ This will show exactly which time points get filtered and why.
 """
 
 import logging
+import math
 import sys
+
+import numpy as np
+
 from simulation import SimulationParameters, simulation_session
 
 logging.basicConfig(
@@ -63,33 +67,33 @@ def analyze_filtering_behavior():
             v3_batt = results.vehicle3_battery_level[i] if i < len(results.vehicle3_battery_level) else 0
             v4_batt = results.vehicle4_battery_level[i] if i < len(results.vehicle4_battery_level) else 0
             
-            # Check if all values are zero
+            # Check if all values are zero (NaN values are excluded)
             data_values = [batt, batt_rech, ev_rech, grid_req, v1_batt, v2_batt, v3_batt, v4_batt]
-            all_zero = all(abs(value) < 1e-10 for value in data_values if not (isinstance(value, float) and value != value))
-            
+            all_zero = all(abs(value) < 1e-10 for value in data_values if not math.isnan(value))
+
             logger.info(f"{time_val:.1f}\t{batt:.3f}\t{batt_rech:.3f}\t{ev_rech:.3f}\t{grid_req:.3f}\t{v1_batt:.3f}\t{v2_batt:.3f}\t{v3_batt:.3f}\t{v4_batt:.3f}\t{all_zero}")
-        
-        # Check if there are any completely zero time points
+
+        # Check if there are any completely zero time points with one
+        # vectorized scan; NaN counts as zero, matching the filter
         logger.info("\nLooking for time points where ALL values are zero:")
-        zero_points_found = 0
-        for i in range(len(results.time_vector)):
-            time_val = results.time_vector[i]
-            batt = results.batt_values[i] if i < len(results.batt_values) else 0
-            batt_rech = results.batt_recharge[i] if i < len(results.batt_recharge) else 0
-            ev_rech = results.ev_recharge[i] if i < len(results.ev_recharge) else 0
-            grid_req = results.grid_request[i] if i < len(results.grid_request) else 0
-            v1_batt = results.vehicle1_battery_level[i] if i < len(results.vehicle1_battery_level) else 0
-            v2_batt = results.vehicle2_battery_level[i] if i < len(results.vehicle2_battery_level) else 0
-            v3_batt = results.vehicle3_battery_level[i] if i < len(results.vehicle3_battery_level) else 0
-            v4_batt = results.vehicle4_battery_level[i] if i < len(results.vehicle4_battery_level) else 0
-            
-            data_values = [batt, batt_rech, ev_rech, grid_req, v1_batt, v2_batt, v3_batt, v4_batt]
-            all_zero = all(abs(value) < 1e-10 for value in data_values if not (isinstance(value, float) and value != value))
-            
-            if all_zero:
-                zero_points_found += 1
-                logger.info(f"  Time {time_val:.1f}: ALL values are zero")
-        
+        data_matrix = np.asarray(
+            [
+                results.batt_values,
+                results.batt_recharge,
+                results.ev_recharge,
+                results.grid_request,
+                results.vehicle1_battery_level,
+                results.vehicle2_battery_level,
+                results.vehicle3_battery_level,
+                results.vehicle4_battery_level,
+            ],
+            dtype=np.float64,
+        )
+        all_zero_mask = (np.abs(np.nan_to_num(data_matrix, nan=0.0)) < 1e-10).all(axis=0)
+        zero_points_found = int(all_zero_mask.sum())
+        for time_val in results.time_vector[all_zero_mask]:
+            logger.info(f"  Time {time_val:.1f}: ALL values are zero")
+
         if zero_points_found == 0:
             logger.info("  No time points found where ALL values are zero - this is why no filtering occurred")
         else:
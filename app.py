@@ -2,12 +2,15 @@
 Web application for MATLAB simulation dashboard with PVWatts integration.
 """
 
+import functools
 import json
 import os
+import queue
+import re
 import time
 import threading
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Dict, Any, List
 
 # Try to import eventlet
@@ -21,6 +24,7 @@ except ImportError:
 
 from flask import Flask, render_template, request, jsonify
 from flask_socketio import SocketIO
+import numpy as np
 import pvwatts
 from simulation import (
     SimulationManager,
@@ -39,15 +43,13 @@ logger = logging.getLogger("simulation_app")
 # Initialize Flask application
 app = Flask(__name__)
 app.config["SECRET_KEY"] = "simulation-dashboard-secret-key"
-# Ensure SocketIO async_mode is compatible with threading if not using eventlet/gevent
+# Ensure SocketIO async_mode is compatible with threading if not using eventlet.
+# Eventlet's green threads keep per-connection overhead low for the many small
+# WebSocket frames this app emits; the threading fallback works everywhere but
+# scales worse under many concurrent clients.
 if HAS_EVENTLET:
     socketio = SocketIO(app, cors_allowed_origins="*", async_mode="eventlet")
-elif False:  # Placeholder if gevent were an option
-    # socketio = SocketIO(app, cors_allowed_origins="*", async_mode='gevent')
-    pass
 else:
-    # Default to threading-based if eventlet (or gevent) is not available
-    # This might be less performant for many concurrent connections but works generally.
     socketio = SocketIO(app, cors_allowed_origins="*")
 
 # Downsampling settings
@@ -60,6 +62,9 @@ simulation_manager = None
 simulation_thread = None
 simulation_running = False
 simulation_lock = threading.Lock()
+# Set after each batch's post-processing so tests and tools can wait for
+# a real completion instead of sleeping a fixed wall-clock interval
+batch_complete_event = threading.Event()
 
 # Global variables for data
 current_simulation_params = SimulationParameters()
@@ -84,18 +89,84 @@ current_pvwatts_settings = {
     "bifaciality": None,  # None means not applicable (non-bifacial)
 }
 
-# DC Watts data from PVWatts
-hourly_dc_watts = []
+# Type coercion for incoming PVWatts settings; anything not listed here is
+# numeric and goes through float(). Built once so the update handler does a
+# single dict lookup per key instead of chained membership tests.
+_PVWATTS_COERCE = {
+    "module_type": int,
+    "array_type": int,
+    "radius": int,
+    "api_key": str,
+    "dataset": str,
+}
+# Optional parameters where an empty value means "clear back to None"
+_PVWATTS_NULLABLE = frozenset({"albedo", "bifaciality"})
+
+# DC Watts data from PVWatts. Held as a contiguous float32 buffer (8760
+# values ~= 35 KB) so per-tick reads are a single array load rather than
+# list-of-PyFloat indirection.
+hourly_dc_watts = np.empty(0, dtype=np.float32)
 current_dc_hour_index = 0
 last_pv_update_hour = -1  # Track the last hour when PV output was updated
 
+# Lookup table mapping (day_of_year - 1) * 24 + hour to an index into
+# hourly_dc_watts. Rebuilt whenever the PVWatts data changes; the modulo
+# wrap is baked in at build time so lookups are a single array load.
+# 366 days covers leap years.
+_hour_index_table = None
+
+
+def _rebuild_hour_index_table():
+    """Rebuild the datetime -> hourly_dc_watts index lookup table."""
+    global _hour_index_table
+    if len(hourly_dc_watts):
+        _hour_index_table = np.arange(366 * 24, dtype=np.int32) % len(hourly_dc_watts)
+    else:
+        _hour_index_table = None
+
+
+def get_hour_index(dt: datetime) -> int:
+    """Get the hourly_dc_watts index for a simulation datetime."""
+    if _hour_index_table is None:
+        logger.warning("hourly_dc_watts not available; falling back to hour index 0")
+        return 0
+    # Day-of-year via ordinal subtraction; avoids the struct_time allocation
+    # that timetuple() makes on every call
+    day_of_year = dt.toordinal() - date(dt.year, 1, 1).toordinal() + 1
+    return int(_hour_index_table[(day_of_year - 1) * 24 + dt.hour])
+
+# Shape check for untrusted "YYYY-MM-DD HH:MM[:SS]" strings from clients.
+# Matching first keeps malformed spam on a cheap regex path instead of
+# paying for a ValueError (traceback construction) in the handler thread.
+_DT_RE = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}(:\d{2})?$")
+
 # Simulation state
 simulation_datetime = datetime(2020, 1, 1, 0, 0, 0)  # Start from January 1, 2020
 total_simulation_seconds = 0
 
+# Cached dict copy of current_simulation_params used for acks, state
+# broadcasts and API responses. Rebuilt lazily after a mutation instead of
+# copying the parameter set on every emit.
+_params_snapshot = None
+
+
+def _invalidate_params_snapshot():
+    """Drop the cached params payload; call after mutating current_simulation_params."""
+    global _params_snapshot
+    _params_snapshot = None
+
+
+def get_params_snapshot() -> Dict[str, Any]:
+    """Get a cached dict copy of the current simulation parameters."""
+    global _params_snapshot
+    if _params_snapshot is None:
+        _params_snapshot = current_simulation_params.to_dict()
+    return _params_snapshot
+
 # WebSocket optimization settings
 WEBSOCKET_THROTTLE_MS = 100  # Minimum time between messages in milliseconds
-last_websocket_message_time = 0  # Last time a message was sent
+WEBSOCKET_THROTTLE_NS = WEBSOCKET_THROTTLE_MS * 1_000_000  # Same threshold in nanoseconds
+last_websocket_message_ns = 0  # Monotonic timestamp (ns) of the last sent message
 
 # Simulation speed control
 # Base delay between points (in seconds). 1.0 means 1 simulation second per real second at 1x speed.
@@ -111,6 +182,27 @@ current_electricity_pricing = {
     "peak_end_hour": 22,  # Peak hours end at 10 PM (22:00)
 }
 
+# Per-hour rate lookup tables derived from current_electricity_pricing.
+# Indexing by hour replaces the peak-window comparison pair on every
+# cost calculation; rebuilt whenever the pricing configuration changes.
+RATE_LUT = np.empty(24, dtype=np.float64)
+TYPE_LUT: List[str] = ["Off-Peak"] * 24
+
+
+def _rebuild_rate_luts() -> None:
+    """Recomputes the hourly rate/type tables from the current pricing."""
+    peak_hours = slice(
+        current_electricity_pricing["peak_start_hour"],
+        current_electricity_pricing["peak_end_hour"],
+    )
+    RATE_LUT[:] = current_electricity_pricing["off_peak_rate"]
+    RATE_LUT[peak_hours] = current_electricity_pricing["peak_rate"]
+    TYPE_LUT[:] = ["Off-Peak"] * 24
+    TYPE_LUT[peak_hours] = ["Peak"] * len(TYPE_LUT[peak_hours])
+
+
+_rebuild_rate_luts()
+
 # Cost tracking variables
 total_grid_cost = 0.0  # Total cost accumulated during simulation
 cost_history = []  # List to store cost data points for charting
@@ -145,20 +237,11 @@ def calculate_electricity_cost(
     # Calculate energy consumption in kWh
     energy_kwh = grid_request_kw * time_hours
 
-    # Determine if it's peak or off-peak time
+    # Look up the rate for this hour directly instead of re-evaluating
+    # the peak window
     current_hour = datetime_obj.hour
-    is_peak = (
-        current_hour >= current_electricity_pricing["peak_start_hour"]
-        and current_hour < current_electricity_pricing["peak_end_hour"]
-    )
-
-    # Get appropriate rate
-    if is_peak:
-        rate = current_electricity_pricing["peak_rate"]
-        rate_type = "Peak"
-    else:
-        rate = current_electricity_pricing["off_peak_rate"]
-        rate_type = "Off-Peak"
+    rate = float(RATE_LUT[current_hour])
+    rate_type = TYPE_LUT[current_hour]
 
     # Calculate cost
     cost = energy_kwh * rate
@@ -202,7 +285,8 @@ def load_pvwatts_dc_data():
                 data = json.load(f)
 
             if "outputs" in data and "dc" in data["outputs"]:
-                hourly_dc_watts = data["outputs"]["dc"]
+                hourly_dc_watts = np.asarray(data["outputs"]["dc"], dtype=np.float32)
+                _rebuild_hour_index_table()
                 logger.info(
                     f"Loaded {len(hourly_dc_watts)} hourly DC watts values from cached PVWatts data"
                 )
@@ -241,7 +325,8 @@ def update_pvwatts_data():
         )
 
         if response and "outputs" in response and "dc" in response["outputs"]:
-            hourly_dc_watts = response["outputs"]["dc"]
+            hourly_dc_watts = np.asarray(response["outputs"]["dc"], dtype=np.float32)
+            _rebuild_hour_index_table()
             logger.info(
                 f"Successfully fetched {len(hourly_dc_watts)} hourly DC watts values"
             )
@@ -272,25 +357,55 @@ def update_pvwatts_data():
         return False
 
 
+# Single background worker for PVWatts re-fetches. A maxsize-1 queue
+# coalesces bursts of slider changes: only the most recent refresh request
+# survives, so the API is hit once instead of once per intermediate value,
+# and the cache file is never written by two threads at once.
+_pvwatts_fetch_queue = queue.Queue(maxsize=1)
+
+
+def request_pvwatts_refresh():
+    """Queue a PVWatts re-fetch, replacing any refresh still waiting."""
+    while True:
+        try:
+            _pvwatts_fetch_queue.put_nowait(True)
+            return
+        except queue.Full:
+            try:
+                _pvwatts_fetch_queue.get_nowait()
+            except queue.Empty:
+                pass
+
+
+def _pvwatts_fetch_worker():
+    """Drain the refresh queue; update_pvwatts_data reads the live settings."""
+    while True:
+        _pvwatts_fetch_queue.get()
+        update_pvwatts_data()
+
+
+_pvwatts_fetch_thread = threading.Thread(target=_pvwatts_fetch_worker, daemon=True)
+_pvwatts_fetch_thread.start()
+
+
 def get_current_dc_watts() -> float:
     """Get the current DC watts for the simulation based on the current hour."""
     global hourly_dc_watts, current_dc_hour_index
 
-    if not hourly_dc_watts:
+    if not len(hourly_dc_watts):
         # Attempt to load if empty, might happen if accessed before initial load completes
         load_pvwatts_dc_data()
-        if not hourly_dc_watts:  # Still no data
+        if not len(hourly_dc_watts):  # Still no data
             logger.warning(
                 "hourly_dc_watts is empty, returning 0.0 for get_current_dc_watts"
             )
             return 0.0
 
-    # Get base value from the current hour
-    base_dc_watts = hourly_dc_watts[
-        current_dc_hour_index % len(hourly_dc_watts)
-    ]  # Added modulo for safety
-
-    return base_dc_watts
+    # Get base value from the current hour; float() so callers (and the
+    # MATLAB engine) see a plain Python float rather than np.float32
+    return float(
+        hourly_dc_watts[current_dc_hour_index % len(hourly_dc_watts)]
+    )  # Added modulo for safety
 
 
 def initialize_simulation(force_restart=False):
@@ -339,14 +454,13 @@ def start_simulation_thread():
             logger.warning("Simulation already running")
             return False  # Reset PV update tracking when starting a new simulation
         # This will be -1 initially but preserved if restarting due to non-PV parameter changes
-        if (
-            not hasattr(current_simulation_params, "_preserve_pv_state")
-            or not current_simulation_params._preserve_pv_state
-        ):
+        # (_preserve_pv_state is a real slot initialized to False, so read it directly)
+        if not current_simulation_params._preserve_pv_state:
             last_pv_update_hour = -1
         else:
             # Clear the preserve flag after using it
             current_simulation_params._preserve_pv_state = False
+        _invalidate_params_snapshot()
 
         simulation_running = True
         simulation_thread = threading.Thread(target=run_continuous_simulation)
@@ -374,25 +488,14 @@ def run_continuous_simulation():
     """Run simulation continuously, sending data point by point."""
     global simulation_running, simulation_manager, current_simulation_params
     global simulation_datetime, total_simulation_seconds, current_dc_hour_index, last_pv_update_hour  # Make sure current_dc_hour_index is global here
-    global last_websocket_message_time
+    global last_websocket_message_ns
 
     logger.info("Starting continuous simulation loop with point-by-point data emission")
 
     try:
         while simulation_running:
             # Update current_dc_hour_index based on the current simulation_datetime for the batch
-            day_of_year = simulation_datetime.timetuple().tm_yday
-            hour_of_day = simulation_datetime.hour
-            calculated_idx = (day_of_year - 1) * 24 + hour_of_day
-
-            temp_current_dc_hour_index = 0
-            if hourly_dc_watts:  # Should be loaded
-                temp_current_dc_hour_index = calculated_idx % len(hourly_dc_watts)
-            else:
-                logger.warning(
-                    "hourly_dc_watts not available in run_continuous_simulation for current_dc_hour_index."
-                )
-                # temp_current_dc_hour_index remains 0 as fallback
+            temp_current_dc_hour_index = get_hour_index(simulation_datetime)
 
             if temp_current_dc_hour_index != current_dc_hour_index:
                 logger.debug(
@@ -426,27 +529,24 @@ def run_continuous_simulation():
             is_grid_peak = 8 <= current_hour < 22
             with simulation_lock:
                 current_simulation_params.GridPeak = 1.0 if is_grid_peak else 0.0
+                _invalidate_params_snapshot()
 
             results = run_single_simulation_batch()
 
-            if results and results.time_vector:
+            if results and len(results.time_vector):
                 # Send each data point individually
                 for i in range(len(results.time_vector)):
                     if not simulation_running:
                         break
 
-                    abs_time_for_point = (
-                        loop_start_total_seconds + results.time_vector[i]
-                    )
+                    time_rel = float(results.time_vector[i])
+                    abs_time_for_point = loop_start_total_seconds + time_rel
                     current_point_datetime = (
-                        batch_start_datetime_for_points
-                        + timedelta(seconds=results.time_vector[i])
+                        batch_start_datetime_for_points + timedelta(seconds=time_rel)
                     )
 
                     # Calculate electricity cost for this data point
-                    grid_request_kw = (
-                        results.grid_request[i] if results.grid_request else 0.0
-                    )
+                    grid_request_kw = float(results.grid_request[i])
                     # Time duration: assume each point represents some fraction of the simulation step
                     time_duration_hours = (
                         SIMULATION_STOP_TIME_S / len(results.time_vector)
@@ -468,38 +568,22 @@ def run_continuous_simulation():
 
                     data_point = {
                         "time_abs": abs_time_for_point,
-                        "time_rel": results.time_vector[i],
-                        "batt_value": (
-                            results.batt_values[i] if results.batt_values else None
-                        ),
-                        "batt_recharge": (
-                            results.batt_recharge[i] if results.batt_recharge else None
-                        ),
-                        "ev_recharge": (
-                            results.ev_recharge[i] if results.ev_recharge else None
-                        ),
-                        "grid_request": (
-                            results.grid_request[i] if results.grid_request else None
-                        ),
-                        "vehicle1_battery_level": (
+                        "time_rel": time_rel,
+                        "batt_value": float(results.batt_values[i]),
+                        "batt_recharge": float(results.batt_recharge[i]),
+                        "ev_recharge": float(results.ev_recharge[i]),
+                        "grid_request": grid_request_kw,
+                        "vehicle1_battery_level": float(
                             results.vehicle1_battery_level[i]
-                            if results.vehicle1_battery_level
-                            else None
                         ),
-                        "vehicle2_battery_level": (
+                        "vehicle2_battery_level": float(
                             results.vehicle2_battery_level[i]
-                            if results.vehicle2_battery_level
-                            else None
                         ),
-                        "vehicle3_battery_level": (
+                        "vehicle3_battery_level": float(
                             results.vehicle3_battery_level[i]
-                            if results.vehicle3_battery_level
-                            else None
                         ),
-                        "vehicle4_battery_level": (
+                        "vehicle4_battery_level": float(
                             results.vehicle4_battery_level[i]
-                            if results.vehicle4_battery_level
-                            else None
                         ),
                         "pv_output_watts": dc_watts_current_hour_avg,
                         "date": current_point_datetime.strftime("%Y-%m-%d"),
@@ -522,8 +606,8 @@ def run_continuous_simulation():
                     socketio.sleep(delay_s)
                 # After processing all points in the batch, update the system's battery SOC
                 # for the next iteration or a new simulation start.
-                if results.batt_values and len(results.batt_values) > 0:
-                    final_soc_from_batch = results.batt_values[-1]
+                if len(results.batt_values) > 0:
+                    final_soc_from_batch = float(results.batt_values[-1])
                     with simulation_lock:
                         # We store the latest SOC value for simulation continuity,                        # but we don't overwrite user-set values during parameter updates
                         # This allows the user's SOC setting to take effect when applying changes
@@ -538,101 +622,35 @@ def run_continuous_simulation():
                                 f"Updated current_simulation_params.battery_soc to {final_soc_from_batch:.2f}% for next batch/simulation."
                             )  # Update bay battery percentages - always update from simulation results for continuity
                 # Bay batteries should reflect charging progress from one simulation batch to the next
-                if (
-                    results.vehicle1_battery_level
-                    and len(results.vehicle1_battery_level) > 0
-                ):
-                    final_bay1_from_batch = results.vehicle1_battery_level[-1]
-                    with simulation_lock:
-                        # Apply persistence logic like battery SOC
-                        if (
-                            not hasattr(
-                                current_simulation_params, "_user_set_bay1_percentage"
-                            )
-                            or not current_simulation_params._user_set_bay1_percentage
-                        ):
-                            current_simulation_params.bay1_percentage = (
-                                final_bay1_from_batch
-                            )
-                            logger.info(
-                                f"Updated bay1_percentage to {final_bay1_from_batch:.2f}% from simulation results for next batch."
-                            )
-                        else:
-                            logger.info(
-                                f"Bay1 percentage preserved - user-set flag prevented update from {final_bay1_from_batch:.2f}%"
-                            )
-
-                if (
-                    results.vehicle2_battery_level
-                    and len(results.vehicle2_battery_level) > 0
-                ):
-                    final_bay2_from_batch = results.vehicle2_battery_level[-1]
-                    with simulation_lock:
-                        # Apply persistence logic like battery SOC
-                        if (
-                            not hasattr(
-                                current_simulation_params, "_user_set_bay2_percentage"
-                            )
-                            or not current_simulation_params._user_set_bay2_percentage
-                        ):
-                            current_simulation_params.bay2_percentage = (
-                                final_bay2_from_batch
-                            )
-                            logger.info(
-                                f"Updated bay2_percentage to {final_bay2_from_batch:.2f}% from simulation results for next batch."
-                            )
-                        else:
-                            logger.info(
-                                f"Bay2 percentage preserved - user-set flag prevented update from {final_bay2_from_batch:.2f}%"
-                            )
-
-                if (
-                    results.vehicle3_battery_level
-                    and len(results.vehicle3_battery_level) > 0
-                ):
-                    final_bay3_from_batch = results.vehicle3_battery_level[-1]
-                    with simulation_lock:
-                        # Apply persistence logic like battery SOC
-                        if (
-                            not hasattr(
-                                current_simulation_params, "_user_set_bay3_percentage"
-                            )
-                            or not current_simulation_params._user_set_bay3_percentage
-                        ):
-                            current_simulation_params.bay3_percentage = (
-                                final_bay3_from_batch
-                            )
-                            logger.info(
-                                f"Updated bay3_percentage to {final_bay3_from_batch:.2f}% from simulation results for next batch."
-                            )
-                        else:
-                            logger.info(
-                                f"Bay3 percentage preserved - user-set flag prevented update from {final_bay3_from_batch:.2f}%"
-                            )
-
-                if (
-                    results.vehicle4_battery_level
-                    and len(results.vehicle4_battery_level) > 0
-                ):
-                    final_bay4_from_batch = results.vehicle4_battery_level[-1]
-                    with simulation_lock:
-                        # Apply persistence logic like battery SOC
-                        if (
-                            not hasattr(
-                                current_simulation_params, "_user_set_bay4_percentage"
-                            )
-                            or not current_simulation_params._user_set_bay4_percentage
-                        ):
-                            current_simulation_params.bay4_percentage = (
-                                final_bay4_from_batch
-                            )
-                            logger.info(
-                                f"Updated bay4_percentage to {final_bay4_from_batch:.2f}% from simulation results for next batch."
-                            )
-                        else:
-                            logger.info(
-                                f"Bay4 percentage preserved - user-set flag prevented update from {final_bay4_from_batch:.2f}%"
-                            )
+                bay_level_series = (
+                    results.vehicle1_battery_level,
+                    results.vehicle2_battery_level,
+                    results.vehicle3_battery_level,
+                    results.vehicle4_battery_level,
+                )
+                final_bay_levels = np.array(
+                    [
+                        float(levels[-1]) if len(levels) else np.nan
+                        for levels in bay_level_series
+                    ],
+                    dtype=np.float64,
+                )
+                with simulation_lock:
+                    # Apply persistence logic like battery SOC; the masked
+                    # vector store updates all four bays in one operation
+                    user_set_mask = current_simulation_params.user_set_mask
+                    current_simulation_params.apply_bay_levels(final_bay_levels)
+                for bay, final_bay_from_batch in enumerate(final_bay_levels, start=1):
+                    if np.isnan(final_bay_from_batch):
+                        continue
+                    if not (user_set_mask & (1 << (bay - 1))):
+                        logger.info(
+                            f"Updated bay{bay}_percentage to {final_bay_from_batch:.2f}% from simulation results for next batch."
+                        )
+                    else:
+                        logger.info(
+                            f"Bay{bay} percentage preserved - user-set flag prevented update from {final_bay_from_batch:.2f}%"
+                        )
                 
                 # Auto-unoccupy fully charged bays
                 for i in range(1, 5):  # Bays 1 to 4
@@ -675,6 +693,11 @@ def run_continuous_simulation():
                                 logger.info(f"Bay {i} auto-unoccupied as EV reached {effective_final_bay_battery_level:.2f}% charge.")
                                 # Frontend will be updated by subsequent new_simulation_point or simulation_state events
 
+            # Batch post-processing above may have rewritten SOC / bay state
+            _invalidate_params_snapshot()
+            # Signal batch completion to any waiter (clear before waiting)
+            batch_complete_event.set()
+
             if not simulation_running:  # Exit loop if stop was requested
                 break  # Advance simulation time for the next batch
             simulation_datetime += timedelta(seconds=SIMULATION_STOP_TIME_S)
@@ -682,12 +705,8 @@ def run_continuous_simulation():
 
             # Update current_dc_hour_index based on the advanced simulation_datetime
             # This ensures consistent hour index calculation regardless of parameter changes
-            day_of_year = simulation_datetime.timetuple().tm_yday
-            hour_of_day = simulation_datetime.hour
-            calculated_idx = (day_of_year - 1) * 24 + hour_of_day
-
-            if hourly_dc_watts:
-                new_dc_hour_index = calculated_idx % len(hourly_dc_watts)
+            if len(hourly_dc_watts):
+                new_dc_hour_index = get_hour_index(simulation_datetime)
                 if new_dc_hour_index != current_dc_hour_index:
                     logger.info(
                         f"Advanced to hour index {new_dc_hour_index} (Date: {simulation_datetime.strftime('%Y-%m-%d %H:%M:%S')})"
@@ -696,11 +715,8 @@ def run_continuous_simulation():
 
             # Notify clients about the overall simulation time advancement (throttled)
             # This event now confirms the batch completion and overall state.
-            current_time_millis = int(round(time.time() * 1000))
-            if (
-                current_time_millis - last_websocket_message_time
-                >= WEBSOCKET_THROTTLE_MS
-            ):
+            now_ns = time.monotonic_ns()
+            if now_ns - last_websocket_message_ns >= WEBSOCKET_THROTTLE_NS:
                 # simulation_datetime here is the start of the *next* batch
                 # is_grid_peak was for the batch that just *completed*
 
@@ -708,16 +724,9 @@ def run_continuous_simulation():
                 next_sim_datetime_for_payload = (
                     simulation_datetime  # This is already advanced
                 )
-                next_day_of_year = next_sim_datetime_for_payload.timetuple().tm_yday
-                next_hour_of_day = next_sim_datetime_for_payload.hour
-                next_dc_hour_index_for_payload = (
-                    next_day_of_year - 1
-                ) * 24 + next_hour_of_day
-
-                if hourly_dc_watts:
-                    next_dc_hour_index_for_payload %= len(hourly_dc_watts)
-                else:
-                    next_dc_hour_index_for_payload = 0  # Fallback
+                next_dc_hour_index_for_payload = get_hour_index(
+                    next_sim_datetime_for_payload
+                )
 
                 socketio.emit(
                     "simulation_time_update",
@@ -735,7 +744,7 @@ def run_continuous_simulation():
                         "grid_peak_status": "Peak" if is_grid_peak else "Off-Peak",
                     },
                 )
-                last_websocket_message_time = current_time_millis
+                last_websocket_message_ns = now_ns
 
     except Exception as e:
         logger.error(f"Error in simulation thread: {e}", exc_info=True)
@@ -788,7 +797,7 @@ def downsample_data(
     data: Dict[str, List],
     threshold: int = DOWNSAMPLING_THRESHOLD,
     target: int = DOWNSAMPLING_TARGET,
-) -> Dict[str, List]:
+) -> Dict[str, Any]:
     """
     Downsample simulation data to reduce network traffic and improve performance.
 
@@ -798,30 +807,54 @@ def downsample_data(
         target: Target number of points after downsampling
 
     Returns:
-        Downsampled data dictionary
+        Dictionary of float32 arrays, downsampled when above the threshold
     """
-    # If data is smaller than threshold or downsampling is disabled, return as is
-    if not ENABLE_DOWNSAMPLING or len(data.get("time", [])) <= threshold:
-        return data
+    # Convert each series to a compact float32 array; this is both the
+    # downsampling input and the binary wire format (4 bytes per value
+    # instead of a JSON-encoded float)
+    arrays = {
+        key: np.asarray(values, dtype=np.float32)
+        for key, values in data.items()
+        if isinstance(values, (list, np.ndarray)) and len(values) > 0
+    }
 
-    # Compute the downsampling rate
-    rate = max(1, len(data["time"]) // target)
+    n_points = len(arrays.get("time", ()))
 
-    # Create a downsampled copy
-    downsampled = {}
+    # If data is smaller than threshold or downsampling is disabled, return as is
+    if not ENABLE_DOWNSAMPLING or n_points <= threshold:
+        return arrays
 
-    # Process each list in the data dictionary
-    for key, values in data.items():
-        if isinstance(values, list) and len(values) > 0:
-            # Select every rate-th element
-            downsampled[key] = values[::rate]
+    # Compute the downsampling rate and select every rate-th element
+    rate = max(1, n_points // target)
+    downsampled = {key: values[::rate] for key, values in arrays.items()}
 
     logger.info(
-        f"Downsampled data from {len(data['time'])} to {len(downsampled['time'])} points"
+        f"Downsampled data from {n_points} to {len(downsampled['time'])} points"
     )
     return downsampled
 
 
+def emit_simulation_data_chunk(data: Dict[str, List]) -> None:
+    """
+    Emit a batch of simulation series to clients as binary float32 buffers.
+
+    Each channel is sent as a little-endian float32 byte string, which
+    python-socketio transmits as a binary attachment frame; the client
+    reconstructs it with new Float32Array(buffer) without JSON parsing.
+    """
+    arrays = downsample_data(data)
+    if not arrays:
+        return
+
+    socketio.emit(
+        "data_chunk",
+        {
+            "channels": {key: values.tobytes() for key, values in arrays.items()},
+            "n": len(arrays.get("time", ())),
+        },
+    )
+
+
 def throttled_emit(event, data=None):
     """
     Throttle WebSocket emissions to avoid overwhelming the client.
@@ -833,14 +866,15 @@ def throttled_emit(event, data=None):
     Returns:
         bool: True if the message was sent, False if throttled
     """
-    global last_websocket_message_time
+    global last_websocket_message_ns
 
-    current_time = time.time() * 1000  # Convert to milliseconds
-    time_since_last = current_time - last_websocket_message_time
+    # Monotonic clock cannot jump backwards, and the integer compare avoids
+    # the float conversion that time.time() * 1000 would require.
+    now_ns = time.monotonic_ns()
 
     # If we've waited long enough, send the message
-    if time_since_last >= WEBSOCKET_THROTTLE_MS:
-        last_websocket_message_time = current_time
+    if now_ns - last_websocket_message_ns >= WEBSOCKET_THROTTLE_NS:
+        last_websocket_message_ns = now_ns
         socketio.emit(event, data)
         return True
 
@@ -848,6 +882,73 @@ def throttled_emit(event, data=None):
     return False
 
 
+class EmitBuffer:
+    """
+    Coalesces per-client Socket.IO emissions into one batched frame.
+
+    Every socketio.emit becomes its own WebSocket frame plus TCP framing
+    overhead, which dwarfs the small ack payloads this app sends. Queued
+    events are flushed as a single "batch" event per client either when a
+    background timer fires or when the pending payload grows large; the
+    client demultiplexes by the embedded event name.
+    """
+
+    FLUSH_INTERVAL_S = 0.01  # Background flush period
+    FLUSH_THRESHOLD_BYTES = 64 * 1024  # Flush a client early past this size
+    MAX_FLUSH_BYTES = 1024 * 1024  # Cap on a single flushed frame
+
+    def __init__(self, sio: SocketIO):
+        self._socketio = sio
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List] = {}  # sid -> [(event, payload), ...]
+        self._pending_bytes: Dict[str, int] = {}
+        self._flusher_started = False
+
+    def queue(self, sid: str, event: str, payload: Any) -> None:
+        """Queue an event for a client, flushing early if the buffer is large."""
+        approx_size = len(repr(payload))
+        with self._lock:
+            self._pending.setdefault(sid, []).append((event, payload))
+            self._pending_bytes[sid] = (
+                self._pending_bytes.get(sid, 0) + approx_size
+            )
+            flush_now = self._pending_bytes[sid] >= self.FLUSH_THRESHOLD_BYTES
+            if not self._flusher_started:
+                self._flusher_started = True
+                self._socketio.start_background_task(self._flush_loop)
+        if flush_now:
+            self.flush(sid)
+
+    def flush(self, sid: str = None) -> None:
+        """Flush pending events for one client (or all clients)."""
+        with self._lock:
+            if sid is None:
+                batches = list(self._pending.items())
+                self._pending.clear()
+                self._pending_bytes.clear()
+            else:
+                batches = [(sid, self._pending.pop(sid, []))]
+                self._pending_bytes.pop(sid, None)
+
+        for client_sid, events in batches:
+            while events:
+                # Bound each flushed frame rather than emitting an unbounded queue
+                frame, frame_bytes = [], 0
+                while events and frame_bytes < self.MAX_FLUSH_BYTES:
+                    event, payload = events.pop(0)
+                    frame.append({"event": event, "data": payload})
+                    frame_bytes += len(repr(payload))
+                self._socketio.emit("batch", frame, to=client_sid)
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._socketio.sleep(self.FLUSH_INTERVAL_S)
+            self.flush()
+
+
+emit_buffer = EmitBuffer(socketio)
+
+
 # Socket.IO Event Handlers (for events from client)
 @socketio.on("connect")
 def handle_connect():
@@ -860,7 +961,7 @@ def handle_connect():
             "simulation_state",
             {
                 "running": simulation_running,
-                "params": current_simulation_params.__dict__,
+                "params": get_params_snapshot(),
                 "pvwatts": current_pvwatts_settings,
                 "datetime": simulation_datetime.strftime("%Y-%m-%d %H:%M:%S"),
                 "total_seconds": total_simulation_seconds,
@@ -920,7 +1021,7 @@ def simulation_params():
 
     if request.method == "GET":
         with simulation_lock:
-            return jsonify(current_simulation_params.__dict__)
+            return jsonify(get_params_snapshot())
 
     elif request.method == "POST":
         try:
@@ -930,12 +1031,13 @@ def simulation_params():
                 for key, value in data.items():
                     if hasattr(current_simulation_params, key):
                         setattr(current_simulation_params, key, float(value))
+                _invalidate_params_snapshot()
 
             return jsonify(
                 {
                     "success": True,
                     "message": "Parameters updated successfully",
-                    "params": current_simulation_params.__dict__,
+                    "params": get_params_snapshot(),
                 }
             )
 
@@ -1030,22 +1132,21 @@ def simulation_control():
             with simulation_lock:
                 if start_date_str and start_time_str:
                     try:
-                        # Ensure time string is in HH:MM:SS format for strptime
+                        # Ensure time string is in HH:MM:SS format
                         if len(start_time_str.split(":")) == 2:  # Format is HH:MM
                             start_time_str += ":00"  # Append seconds
 
-                        user_start_datetime = datetime.strptime(
-                            f"{start_date_str} {start_time_str}", "%Y-%m-%d %H:%M:%S"
+                        # fromisoformat is much faster than strptime and skips
+                        # the format-string parser entirely
+                        user_start_datetime = datetime.fromisoformat(
+                            f"{start_date_str}T{start_time_str}"
                         )
 
                         # Update globals
                         simulation_datetime = user_start_datetime
                         total_simulation_seconds = 0  # Reset for the new logical start                        # Reset PV update tracking only if starting with a new date/time
                         # If this is a parameter update restart, preserve PV state
-                        if (
-                            not hasattr(current_simulation_params, "_preserve_pv_state")
-                            or not current_simulation_params._preserve_pv_state
-                        ):
+                        if not current_simulation_params._preserve_pv_state:
                             last_pv_update_hour = -1
                         else:
                             logger.info(
@@ -1083,19 +1184,7 @@ def simulation_control():
                                 setattr(current_simulation_params, bay_attr, False)
                                 logger.info(f"Reset {bay_attr} flag for new simulation")
 
-                        day_of_year = simulation_datetime.timetuple().tm_yday
-                        hour_of_day = simulation_datetime.hour
-                        calculated_idx = (day_of_year - 1) * 24 + hour_of_day
-
-                        if hourly_dc_watts:  # Should be loaded by now
-                            current_dc_hour_index = calculated_idx % len(
-                                hourly_dc_watts
-                            )
-                        else:
-                            logger.warning(
-                                "hourly_dc_watts not available for precise initial current_dc_hour_index setting during simulation start."
-                            )
-                            current_dc_hour_index = 0  # Fallback
+                        current_dc_hour_index = get_hour_index(simulation_datetime)
 
                         logger.info(
                             f"Simulation starting from user-defined datetime: {simulation_datetime.strftime('%Y-%m-%d %H:%M:%S')}, initial hour index: {current_dc_hour_index}"
@@ -1108,10 +1197,7 @@ def simulation_control():
                 else:
                     # Reset PV update tracking only if this is a true new simulation start
                     # Not when restarting due to parameter changes
-                    if (
-                        not hasattr(current_simulation_params, "_preserve_pv_state")
-                        or not current_simulation_params._preserve_pv_state
-                    ):
+                    if not current_simulation_params._preserve_pv_state:
                         last_pv_update_hour = -1
                     else:
                         logger.info(
@@ -1126,6 +1212,7 @@ def simulation_control():
                     logger.info(
                         f"No user-defined start time provided. Simulation will start/resume from: {simulation_datetime.strftime('%Y-%m-%d %H:%M:%S')}"
                     )
+                _invalidate_params_snapshot()
 
             # Proceed with initialization and starting the thread (outside the lock for these calls)
             if initialize_simulation():  # Initialize MATLAB engine if needed
@@ -1281,6 +1368,7 @@ def handle_electricity_pricing():
                     "peak_end_hour": int(data["peak_end_hour"]),
                 }
             )
+            _rebuild_rate_luts()
 
             logger.info(f"Electricity pricing updated: {current_electricity_pricing}")
 
@@ -1353,7 +1441,7 @@ def get_current_simulation_state_payload() -> Dict[str, Any]:
     """Constructs the payload for the simulation_state event."""
     global simulation_running, current_simulation_params, current_pvwatts_settings, simulation_datetime, total_simulation_seconds, current_simulation_speed_multiplier
     with simulation_lock:
-        params_dict = current_simulation_params.__dict__
+        params_dict = get_params_snapshot()
         pvwatts_dict = current_pvwatts_settings
         is_running = simulation_running
         sim_dt = simulation_datetime
@@ -1378,34 +1466,22 @@ def get_current_simulation_state_payload() -> Dict[str, Any]:
     }
 
 
-# WebSocket events
-@socketio.on("connect")
-def handle_connect():
-    """Handle client connection."""
-    logger.info(f"Client connected: {request.sid}")
+# Parameters whose change should trigger a PV state reset, and the
+# datetime keys that force one too; frozensets so the key checks below
+# are single hash probes rather than per-key scans
+_PV_KEYS = frozenset({"PVOutput"})
+_DT_KEYS = frozenset({"initial_start_date", "initial_start_time"})
 
-    # Send current simulation state to the new client
-    with simulation_lock:
-        socketio.emit(
-            "simulation_state",
-            {
-                "running": simulation_running,
-                "params": current_simulation_params.__dict__,
-                "pvwatts": current_pvwatts_settings,
-                "datetime": simulation_datetime.strftime("%Y-%m-%d %H:%M:%S"),
-                "total_seconds": total_simulation_seconds,
-                "date": simulation_datetime.strftime("%Y-%m-%d"),
-                "time": simulation_datetime.strftime("%H:%M:%S"),
-                "speed": current_simulation_speed_multiplier,  # Include current speed
-            },
-            to=request.sid,
-        )
 
+@functools.lru_cache(maxsize=64)
+def _classify_update(key_fs: frozenset) -> tuple:
+    """Classifies an update payload's key set as (pv_changed, datetime_changed).
 
-@socketio.on("disconnect")
-def handle_disconnect():
-    """Handle client disconnection."""
-    logger.info(f"Client disconnected: {request.sid}")
+    The classification depends only on which keys are present, and the
+    UI sends the same handful of payload shapes over and over, so the
+    result is cached per distinct key set.
+    """
+    return (bool(_PV_KEYS & key_fs), not _DT_KEYS.isdisjoint(key_fs))
 
 
 @socketio.on("update_simulation_params")
@@ -1415,23 +1491,18 @@ def handle_update_params(data):
 
     try:
         with simulation_lock:
-            # Track if any PV-related parameters are being changed
-            pv_params_changed = False
-            datetime_changed = (
-                "initial_start_date" in data or "initial_start_time" in data
+            # Track if any PV-related parameters are being changed; the
+            # classification only depends on the payload's key set, so
+            # repeated UI payload shapes hit the cache
+            pv_params_changed, datetime_changed = _classify_update(
+                frozenset(data.keys())
             )
 
-            # List of PV-related parameters that should trigger PV state reset
-            pv_related_params = {"PVOutput"}
-
-            # Check if any PV parameters are being updated
-            for key in data.keys():
-                if key in pv_related_params:
-                    pv_params_changed = True
-                    logger.info(
-                        f"PV parameter '{key}' is being changed, will reset PV state"
-                    )
-                    break
+            if pv_params_changed:
+                logger.info(
+                    "PV parameter(s) %s being changed, will reset PV state",
+                    sorted(_PV_KEYS & data.keys()),
+                )
 
             # If only non-PV parameters are changing and no datetime change, preserve PV state
             if not pv_params_changed and not datetime_changed:
@@ -1441,14 +1512,15 @@ def handle_update_params(data):
                 )
             else:
                 # Clear any existing preserve flag
-                if hasattr(current_simulation_params, "_preserve_pv_state"):
-                    current_simulation_params._preserve_pv_state = False
+                current_simulation_params._preserve_pv_state = False
                 if pv_params_changed:
                     logger.info("PV parameters changed, PV state will be reset")
                 if datetime_changed:
                     logger.info("Date/time changed, PV state will be reset")
 
-            # Update parameters
+            # Update parameters, accumulating a single summary log entry
+            # instead of one logger.info per changed attribute
+            changed = []
             for key, value in data.items():
                 if key == "initial_start_date" or key == "initial_start_time":
                     # Store the initial start date/time but don't update simulation_datetime yet
@@ -1457,107 +1529,89 @@ def handle_update_params(data):
                 elif hasattr(current_simulation_params, key):
                     # Convert value to float for numeric parameters
                     float_value = float(value)
-                    setattr(
-                        current_simulation_params, key, float_value
-                    )  # Mark battery_soc as user-set so it doesn't get overwritten by simulation
+                    setattr(current_simulation_params, key, float_value)
+                    changed.append((key, float_value))
+
+                    # Mark battery_soc as user-set so it doesn't get overwritten by simulation
                     if key == "battery_soc":
                         setattr(
                             current_simulation_params, "_user_set_battery_soc", True
                         )
-                        logger.info(
-                            f"User manually set battery_soc to {float_value:.2f}%"
-                        )
 
                     # Mark bay percentages as user-set so they don't get overwritten by simulation
                     # Also mark bay_occupied as user-set if percentage is provided for an occupied bay
-                    if key == "bay1_percentage":
+                    if key in ("bay1_percentage", "bay2_percentage", "bay3_percentage", "bay4_percentage"):
+                        bay = key[3]
                         setattr(
-                            current_simulation_params, "_user_set_bay1_percentage", True
+                            current_simulation_params,
+                            f"_user_set_bay{bay}_percentage",
+                            True,
                         )
-                        logger.info(
-                            f"User manually set bay1_percentage to {float_value:.2f}%"
-                        )
-                        if getattr(current_simulation_params, "bay1_occupied", 0.0) == 1.0:
-                             setattr(current_simulation_params, "_user_set_bay1_occupied", True)
-                    elif key == "bay2_percentage":
-                        setattr(
-                            current_simulation_params, "_user_set_bay2_percentage", True
-                        )
-                        logger.info(
-                            f"User manually set bay2_percentage to {float_value:.2f}%"
-                        )
-                        if getattr(current_simulation_params, "bay2_occupied", 0.0) == 1.0:
-                             setattr(current_simulation_params, "_user_set_bay2_occupied", True)
-                    elif key == "bay3_percentage":
-                        setattr(
-                            current_simulation_params, "_user_set_bay3_percentage", True
-                        )
-                        logger.info(
-                            f"User manually set bay3_percentage to {float_value:.2f}%"
-                        )
-                        if getattr(current_simulation_params, "bay3_occupied", 0.0) == 1.0:
-                             setattr(current_simulation_params, "_user_set_bay3_occupied", True)
-                    elif key == "bay4_percentage":
+                        if getattr(current_simulation_params, f"bay{bay}_occupied", 0.0) == 1.0:
+                            setattr(
+                                current_simulation_params,
+                                f"_user_set_bay{bay}_occupied",
+                                True,
+                            )
+                    # Explicitly handle bay_occupied flags if they are part of the update
+                    elif key in ("bay1_occupied", "bay2_occupied", "bay3_occupied", "bay4_occupied"):
                         setattr(
-                            current_simulation_params, "_user_set_bay4_percentage", True
+                            current_simulation_params, f"_user_set_{key}", True
                         )
-                        logger.info(
-                            f"User manually set bay4_percentage to {float_value:.2f}%"
-                        )
-                        if getattr(current_simulation_params, "bay4_occupied", 0.0) == 1.0:
-                             setattr(current_simulation_params, "_user_set_bay4_occupied", True)
-                    # Explicitly handle bay_occupied flags if they are part of the update
-                    elif key == "bay1_occupied":
-                        setattr(current_simulation_params, "_user_set_bay1_occupied", True)
-                        logger.info(f"User manually set bay1_occupied to {float_value}")
-                    elif key == "bay2_occupied":
-                        setattr(current_simulation_params, "_user_set_bay2_occupied", True)
-                        logger.info(f"User manually set bay2_occupied to {float_value}")
-                    elif key == "bay3_occupied":
-                        setattr(current_simulation_params, "_user_set_bay3_occupied", True)
-                        logger.info(f"User manually set bay3_occupied to {float_value}")
-                    elif key == "bay4_occupied":
-                        setattr(current_simulation_params, "_user_set_bay4_occupied", True)
-                        logger.info(f"User manually set bay4_occupied to {float_value}")
+
+            if changed and logger.isEnabledFor(logging.INFO):
+                logger.info("User updated parameters: %s", changed)
+            _invalidate_params_snapshot()
 
 
         # For date parameters, store them separately for the next simulation start
         if "initial_start_date" in data and "initial_start_time" in data:
-            try:
-                # Parse the date/time strings (validation only, don't update simulation_datetime yet)
-                start_date_str = data.get("initial_start_date")
-                start_time_str = data.get("initial_start_time")
-
-                # Ensure time string is in HH:MM:SS format
-                if len(start_time_str.split(":")) == 2:
-                    start_time_str += ":00"
-
-                # Validate the datetime (but don't set it yet)
-                datetime.strptime(
-                    f"{start_date_str} {start_time_str}", "%Y-%m-%d %H:%M:%S"
-                )
-                logger.info(
-                    f"Validated new start datetime: {start_date_str} {start_time_str} (will be applied on next simulation start)"
+            # Parse the date/time strings (validation only, don't update simulation_datetime yet)
+            start_date_str = data.get("initial_start_date")
+            start_time_str = data.get("initial_start_time")
+
+            # Cheap shape gate so malformed client spam never reaches the
+            # parser's exception path (raising and formatting a ValueError
+            # costs far more than an anchored regex miss)
+            if not _DT_RE.match(f"{start_date_str} {start_time_str}"):
+                logger.warning(
+                    f"Invalid datetime format in parameters: '{start_date_str} {start_time_str}'"
                 )
-            except ValueError as e:
-                logger.warning(f"Invalid datetime format in parameters: {e}")
+            else:
+                try:
+                    # Ensure time string is in HH:MM:SS format
+                    if len(start_time_str.split(":")) == 2:
+                        start_time_str += ":00"
+
+                    # Validate the datetime (but don't set it yet); fromisoformat
+                    # skips the strptime format-string machinery
+                    datetime.fromisoformat(f"{start_date_str}T{start_time_str}")
+                    logger.info(
+                        f"Validated new start datetime: {start_date_str} {start_time_str} (will be applied on next simulation start)"
+                    )
+                except ValueError as e:
+                    # Well-shaped but impossible dates (e.g. month 13)
+                    logger.warning(f"Invalid datetime format in parameters: {e}")
 
-        # Acknowledge update
-        socketio.emit(
+        # Acknowledge update; snapshot under the lock so the encoder never
+        # walks a dict the simulation thread is mutating
+        with simulation_lock:
+            params_snapshot = get_params_snapshot()
+        emit_buffer.queue(
+            request.sid,
             "params_updated",
             {
                 "success": True,
                 "message": "Parameters updated successfully",
-                "params": current_simulation_params.__dict__,
+                "params": params_snapshot,
             },
-            to=request.sid,
         )
 
     except Exception as e:
-        socketio.emit(
+        emit_buffer.queue(
+            request.sid,
             "params_updated",
             {"success": False, "message": f"Error updating parameters: {str(e)}"},
-            to=request.sid,
         )
 
 
@@ -1567,49 +1621,56 @@ def handle_update_pvwatts(data):
     global current_pvwatts_settings
 
     try:  # Update PVWatts settings
+        settings_changed = False
         for key, value in data.items():
             if key in current_pvwatts_settings:
                 # Handle empty values for optional parameters
                 if value == "" or value is None:
-                    if key in [
-                        "albedo",
-                        "bifaciality",
-                    ]:  # Optional parameters that can be None
-                        current_pvwatts_settings[key] = None
+                    if key in _PVWATTS_NULLABLE:
+                        new_value = None
                     else:
                         continue  # Skip empty required parameters
-                # Convert to appropriate type
-                elif key in ["module_type", "array_type", "radius"]:
-                    current_pvwatts_settings[key] = int(value)
-                elif key in ["api_key", "dataset"]:
-                    current_pvwatts_settings[key] = str(value)
                 else:
-                    current_pvwatts_settings[key] = float(value)
-
-        # Fetch new data in a background thread to avoid blocking
-        def fetch_data_thread():
-            success = update_pvwatts_data()
+                    coerce = _PVWATTS_COERCE.get(key, float)
+                    new_value = coerce(value)
+                if current_pvwatts_settings[key] != new_value:
+                    current_pvwatts_settings[key] = new_value
+                    settings_changed = True
+
+        # Slider UIs re-send the same values on every drag tick; nothing
+        # changed means nothing to fetch
+        if not settings_changed:
+            emit_buffer.queue(
+                request.sid,
+                "pvwatts_settings_updated",
+                {
+                    "success": True,
+                    "message": "No change",
+                    "settings": current_pvwatts_settings,
+                },
+            )
+            return
 
-        thread = threading.Thread(target=fetch_data_thread)
-        thread.daemon = True
-        thread.start()
+        # Fetch new data on the shared worker to avoid blocking; rapid
+        # successive updates coalesce to a single fetch of the latest settings
+        request_pvwatts_refresh()
 
         # Acknowledge the settings update immediately
-        socketio.emit(
+        emit_buffer.queue(
+            request.sid,
             "pvwatts_settings_updated",
             {
                 "success": True,
                 "message": "Settings updated, fetching new data...",
                 "settings": current_pvwatts_settings,
             },
-            to=request.sid,
         )
 
     except Exception as e:
-        socketio.emit(
+        emit_buffer.queue(
+            request.sid,
             "pvwatts_settings_updated",
             {"success": False, "message": f"Error updating PVWatts settings: {str(e)}"},
-            to=request.sid,
         )
 
 
@@ -1634,20 +1695,13 @@ if (
             )  # Start from January 1, 2020
             total_simulation_seconds = 0
 
-            # Calculate the hour index based on the simulation date
-            day_of_year = simulation_datetime.timetuple().tm_yday
-            hour_of_day = simulation_datetime.hour
-            calculated_idx = (day_of_year - 1) * 24 + hour_of_day
-
             # Set the current hour index for PVWatts data
-            if hourly_dc_watts:
-                current_dc_hour_index = calculated_idx % len(hourly_dc_watts)
-            else:
-                current_dc_hour_index = 0
+            current_dc_hour_index = get_hour_index(simulation_datetime)
 
             # Reset user-set flags for battery SOC
             if hasattr(current_simulation_params, "_user_set_battery_soc"):
                 delattr(current_simulation_params, "_user_set_battery_soc")
+            _invalidate_params_snapshot()
 
         # Start the simulation thread
         if start_simulation_thread():
@@ -1678,16 +1732,15 @@ if __name__ == "__main__":
     parser.add_argument(
         "--host", type=str, default="0.0.0.0", help="Host to bind to (default: 0.0.0.0)"
     )
-    args = parser.parse_args()    # Use eventlet if available and patched, otherwise fall back to Flask's default dev server (Werkzeug)
-    if HAS_EVENTLET:
-        socketio.run(app, debug=True, host=args.host, port=args.port, use_reloader=False)
-    else:
+    args = parser.parse_args()
+
+    # Use eventlet if available and patched, otherwise fall back to Flask's
+    # default dev server (Werkzeug), which is not ideal for socketio production
+    if not HAS_EVENTLET:
         logger.warning(
             "Eventlet not available. Running with Flask's default development server (Werkzeug)."
         )
         logger.warning(
-            "For production or better WebSocket performance, consider installing eventlet or gevent."
+            "For production or better WebSocket performance, consider installing eventlet."
         )
-        socketio.run(
-            app, debug=True, host=args.host, port=args.port, use_reloader=False
-        )  # Werkzeug might not be ideal for socketio production
+    socketio.run(app, debug=True, host=args.host, port=args.port, use_reloader=False)
@@ -1,11 +1,121 @@
+import hashlib
 import requests
 import json
 import os
+import time
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional
 
+# Try to use orjson for the float-heavy hourly arrays; it is several times
+# faster than the stdlib json module for both directions
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _load_json_file(path: str) -> Dict[str, Any]:
+    """Loads a JSON file with orjson when available."""
+    if HAS_ORJSON:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _dump_json_file(obj: Dict[str, Any], path: str) -> None:
+    """
+    Writes a JSON file with orjson when available.
+
+    Writes to a temp file and renames over the target so a crash mid-write
+    never leaves a truncated file (which would read as corrupt and force a
+    pointless re-fetch on the next startup).
+    """
+    tmp_path = path + ".tmp"
+    if HAS_ORJSON:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, "w") as f:
+            json.dump(obj, f, indent=2)
+    os.replace(tmp_path, path)
+
 
 # Cache settings
-CACHE_FILE = "pvwatts_response.json"
+CACHE_FILE = "pvwatts_response.json"  # Always holds the most recent response
+CACHE_DIR = "cache"  # Keyed store so distinct parameter sets coexist
+CACHE_EXPIRY_DAYS = 30  # PVWatts TMY output only changes when NREL updates datasets
+_CACHE_EXPIRY_SECONDS = CACHE_EXPIRY_DAYS * 86400
+
+# Shared session so repeated fetches (force_refresh, background re-fetches
+# from the dashboard) reuse the TCP+TLS connection instead of paying a new
+# handshake each time
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+_session.headers.update(
+    {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+)
+
+# (connect, read) timeouts; the hourly dataset can take a while to generate
+_REQUEST_TIMEOUT = (5, 30)
+
+
+def _cache_key(
+    system_capacity, module_type, losses, array_type, lat, lon, tilt, azimuth
+) -> str:
+    """
+    Builds a canonical hash key for a PVWatts parameter set.
+
+    Parameters are rounded to the same precision the old tolerance checks
+    used, so float jitter maps to the same key.
+    """
+    canonical = json.dumps(
+        {
+            "system_capacity": round(system_capacity, 2),
+            "module_type": module_type,
+            "losses": round(losses, 1),
+            "array_type": array_type,
+            "lat": round(lat, 2),
+            "lon": round(lon, 2),
+            "tilt": round(tilt, 1),
+            "azimuth": round(azimuth, 1),
+        },
+        sort_keys=True,
+    )
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    """Returns the on-disk path for a cache key."""
+    return os.path.join(CACHE_DIR, f"pvwatts_{key}.json")
+
+
+def _meta_path(payload_path: str) -> str:
+    """Returns the sidecar metadata path for a cached payload file."""
+    return payload_path + ".meta.json"
+
+
+def _read_cache_metadata(payload_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Reads the sidecar metadata for a cached payload.
+
+    The sidecar is a few hundred bytes, so inspecting request parameters
+    does not require parsing the hourly arrays in the payload itself.
+    Falls back to the payload file for entries written before the sidecar
+    existed (which embed request_params directly).
+    """
+    try:
+        return _load_json_file(_meta_path(payload_path))
+    except (FileNotFoundError, ValueError):
+        pass
+
+    try:
+        data = _load_json_file(payload_path)
+        return {"request_params": data.get("request_params")}
+    except (FileNotFoundError, ValueError):
+        return None
 
 
 def get_pvwatts_data(
@@ -64,20 +174,60 @@ def get_pvwatts_data(
         if param in optional_params and optional_params[param] is not None and optional_params[param] != "":
             params[param] = optional_params[param]
     
+    # Revalidate instead of re-download when we hold a (possibly expired)
+    # copy of this exact parameter set: a 304 costs one round trip with no
+    # body and no JSON parse
+    cache_path = _cache_path(
+        _cache_key(
+            system_capacity, module_type, losses, array_type, lat, lon, tilt, azimuth
+        )
+    )
+    headers = {}
+    if os.path.exists(cache_path):
+        metadata = _read_cache_metadata(cache_path) or {}
+        if metadata.get("etag"):
+            headers["If-None-Match"] = metadata["etag"]
+        if metadata.get("last_modified"):
+            headers["If-Modified-Since"] = metadata["last_modified"]
+
     response = None
     try:
-        response = requests.get(base_url, params=params)
+        response = _session.get(
+            base_url, params=params, headers=headers, timeout=_REQUEST_TIMEOUT
+        )
+        if response.status_code == 304:
+            print("PVWatts data unchanged (HTTP 304); reusing cached payload")
+            try:
+                cached_data = _load_json_file(cache_path)
+            except (FileNotFoundError, ValueError):
+                cached_data = None
+            if cached_data is not None:
+                # Re-stamp the entry so the expiry clock restarts
+                write_to_cache(
+                    cached_data,
+                    system_capacity, module_type, losses, array_type,
+                    lat, lon, tilt, azimuth,
+                    response_headers=response.headers,
+                )
+                return cached_data
+            # Cached payload vanished or is corrupt; fall through to a full
+            # unconditional fetch
+            response = _session.get(base_url, params=params, timeout=_REQUEST_TIMEOUT)
         response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
-        
+
         # Parse the JSON response
-        response_data = response.json()
-        
+        if HAS_ORJSON:
+            response_data = orjson.loads(response.content)
+        else:
+            response_data = response.json()
+
         # Save to cache
         write_to_cache(
             response_data,
-            system_capacity, module_type, losses, array_type, lat, lon, tilt, azimuth
+            system_capacity, module_type, losses, array_type, lat, lon, tilt, azimuth,
+            response_headers=response.headers,
         )
-        
+
         return response_data
     except requests.exceptions.RequestException as e:
         print(f"Error calling PVWatts API: {e}")
@@ -108,40 +258,44 @@ def read_from_cache(
         azimuth (float): Azimuth angle (degrees). Range: 0 to 359.9.
 
     Returns:
-        dict: The cached data as a dictionary, or None if not found or parameters don't match.
+        dict: The cached data as a dictionary, or None if not found.
     """
-    if not os.path.exists(CACHE_FILE):
-        return None
+    cache_path = _cache_path(
+        _cache_key(
+            system_capacity, module_type, losses, array_type, lat, lon, tilt, azimuth
+        )
+    )
 
-    try:
-        with open(CACHE_FILE, "r") as f:
-            cached_data = json.load(f)
+    # Inspect the tiny sidecar first; only a usable entry pays for parsing
+    # the full payload with its hourly arrays. A missing entry surfaces as
+    # FileNotFoundError on open rather than a separate exists() stat.
+    metadata = _read_cache_metadata(cache_path)
+    if metadata is None:
+        return None
 
-        # Check if the requested parameters match the cached data
-        request_params = cached_data.get("request_params", {})
-        
-        # Compare the key parameters
-        if (abs(request_params.get("system_capacity", 0) - system_capacity) < 0.01 and
-            request_params.get("module_type") == module_type and
-            abs(request_params.get("losses", 0) - losses) < 0.1 and
-            request_params.get("array_type") == array_type and
-            abs(request_params.get("lat", 0) - lat) < 0.01 and
-            abs(request_params.get("lon", 0) - lon) < 0.01 and
-            abs(request_params.get("tilt", 0) - tilt) < 0.1 and
-            abs(request_params.get("azimuth", 0) - azimuth) < 0.1):
-            
-            # We found a match with close enough parameters
-            return cached_data
-        
+    # Age check against the recorded creation time; entries written before
+    # the sidecar existed have no created_at and fall back to file mtime
+    created_at = metadata.get("created_at")
+    if created_at is None:
+        try:
+            created_at = os.path.getmtime(cache_path)
+        except FileNotFoundError:
+            return None
+    if time.time() - created_at >= _CACHE_EXPIRY_SECONDS:
+        print("Cached PVWatts data expired; fetching fresh data")
         return None
-    except (json.JSONDecodeError, KeyError, FileNotFoundError) as e:
+
+    try:
+        return _load_json_file(cache_path)
+    except (ValueError, KeyError, FileNotFoundError) as e:
         print(f"Error reading from cache: {e}")
         return None
 
 
 def write_to_cache(
-    response_data: Dict[str, Any], 
-    system_capacity, module_type, losses, array_type, lat, lon, tilt, azimuth
+    response_data: Dict[str, Any],
+    system_capacity, module_type, losses, array_type, lat, lon, tilt, azimuth,
+    response_headers: Optional[Dict[str, str]] = None,
 ) -> None:
     """
     Writes API response data to cache file.
@@ -156,27 +310,40 @@ def write_to_cache(
         lon (float): Longitude (degrees).
         tilt (float): Tilt angle (degrees).
         azimuth (float): Azimuth angle (degrees).
+        response_headers (dict, optional): HTTP response headers; ETag and
+            Last-Modified are kept for conditional revalidation.
     """
-    # Add metadata to the response data
-    enhanced_data = response_data.copy()
-    
-    # Add request parameters
-    enhanced_data["request_params"] = {
-        "system_capacity": system_capacity,
-        "module_type": module_type,
-        "losses": losses,
-        "array_type": array_type,
-        "lat": lat,
-        "lon": lon,
-        "tilt": tilt,
-        "azimuth": azimuth
+    # Keep the payload file as the pure API response; request parameters go
+    # into a small sidecar so the read path can inspect them cheaply
+    metadata = {
+        "created_at": time.time(),
+        "etag": (response_headers or {}).get("ETag"),
+        "last_modified": (response_headers or {}).get("Last-Modified"),
+        "request_params": {
+            "system_capacity": system_capacity,
+            "module_type": module_type,
+            "losses": losses,
+            "array_type": array_type,
+            "lat": lat,
+            "lon": lon,
+            "tilt": tilt,
+            "azimuth": azimuth,
+        }
     }
-    
-    # Write to cache file
+
+    # Write to the keyed store plus the legacy "latest response" file that
+    # the dashboard loads at startup
+    cache_path = _cache_path(
+        _cache_key(
+            system_capacity, module_type, losses, array_type, lat, lon, tilt, azimuth
+        )
+    )
     try:
-        with open(CACHE_FILE, "w") as f:
-            json.dump(enhanced_data, f, indent=2)
-        print(f"Cached PVWatts data to {CACHE_FILE}")
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        for path in (cache_path, CACHE_FILE):
+            _dump_json_file(response_data, path)
+            _dump_json_file(metadata, _meta_path(path))
+        print(f"Cached PVWatts data to {cache_path}")
     except IOError as e:
         print(f"Error caching PVWatts data: {e}")
 
@@ -195,22 +362,20 @@ def get_cache_status() -> Dict[str, Any]:
         "last_modified": None
     }
     
-    if not os.path.exists(CACHE_FILE):
+    # One stat(2) instead of separate exists/getsize/getmtime calls
+    try:
+        st = os.stat(CACHE_FILE)
+    except FileNotFoundError:
         return cache_info
-    
+
     cache_info["exists"] = True
-    cache_info["size_bytes"] = os.path.getsize(CACHE_FILE)
-    cache_info["last_modified"] = os.path.getmtime(CACHE_FILE)
-    
-    try:
-        with open(CACHE_FILE, "r") as f:
-            cached_data = json.load(f)
-        
-        cache_info["parameters"] = cached_data.get("request_params")
-        
-    except (json.JSONDecodeError, FileNotFoundError):
-        pass
+    cache_info["size_bytes"] = st.st_size
+    cache_info["last_modified"] = st.st_mtime
     
+    metadata = _read_cache_metadata(CACHE_FILE)
+    if metadata is not None:
+        cache_info["parameters"] = metadata.get("request_params")
+
     return cache_info
 
 
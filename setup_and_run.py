@@ -0,0 +1,524 @@
+"""
+Cross-platform setup and launch script for the Smart Grid-Integrated EV
+Charging System.
+
+Python counterpart of run.ps1: checks the Python and MATLAB installations,
+verifies the required project files, installs dependencies, picks a free
+port and starts the dashboard (app.py), opening a browser tab once the
+server is up.
+
+Usage:
+    python setup_and_run.py [--port 5000] [--host 0.0.0.0]
+                            [--skip-install] [--quick-start] [--no-browser]
+"""
+
+import argparse
+import functools
+import glob
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# psutil gives nicer "who is using this port" output, but the script works
+# without it (netstat fallback on Windows)
+try:
+    import psutil
+
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+# Files the dashboard cannot run without
+REQUIRED_FILES = [
+    "app.py",
+    "simulation.py",
+    "pvwatts.py",
+    "requirements.txt",
+    "CompleteV1.slx",
+    "sim_the_model.m",
+    "templates/index.html",
+    "static/js/script.js",
+]
+
+
+_COLORS = {
+    "red": "\033[91m",
+    "green": "\033[92m",
+    "yellow": "\033[93m",
+    "cyan": "\033[96m",
+    "magenta": "\033[95m",
+    "white": "\033[97m",
+}
+_RESET = "\033[0m"
+
+# Enable VT escape-sequence processing once at import on Windows consoles
+# (0x0004 = ENABLE_VIRTUAL_TERMINAL_PROCESSING) instead of spawning
+# 'cmd /c color' on every print
+if sys.platform == "win32":
+    import ctypes
+
+    _kernel32 = ctypes.windll.kernel32
+    _stdout_handle = _kernel32.GetStdHandle(-11)
+    _console_mode = ctypes.c_ulong()
+    if _kernel32.GetConsoleMode(_stdout_handle, ctypes.byref(_console_mode)):
+        _kernel32.SetConsoleMode(_stdout_handle, _console_mode.value | 0x0004)
+
+
+def colored_print(message, color="white"):
+    """Print a message in the given ANSI color."""
+    print(f"{_COLORS.get(color, _COLORS['white'])}{message}{_RESET}")
+
+
+class BufferedOutput:
+    """
+    Collects colored lines and writes them in one syscall.
+
+    Check phases print dozens of one-line statuses; each print() acquires
+    the stdout lock and flushes on newline for line-buffered TTYs, so
+    batching them into a single write is measurably cheaper (especially on
+    Windows consoles).
+    """
+
+    def __init__(self):
+        self._lines = []
+
+    def add(self, message, color="white"):
+        self._lines.append(f"{_COLORS.get(color, _COLORS['white'])}{message}{_RESET}")
+
+    def flush(self):
+        if self._lines:
+            sys.stdout.write("\n".join(self._lines) + "\n")
+            sys.stdout.flush()
+            self._lines.clear()
+
+
+def is_port_available(port, host="localhost"):
+    """
+    Check whether anything is already listening on the given port.
+
+    Uses a short non-blocking connect probe rather than bind(): a failed
+    connect is one syscall, cannot fail for bind-only reasons (permissions,
+    lingering SO_REUSEADDR state) and leaves no TIME_WAIT residue. Every
+    address family getaddrinfo resolves for the host is probed, so an
+    IPv6-only listener doesn't make the port look free.
+    """
+    try:
+        addrinfos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror:
+        return False
+    for family, sock_type, proto, _, sockaddr in addrinfos:
+        with socket.socket(family, sock_type, proto) as s:
+            s.settimeout(0.05)
+            if s.connect_ex(sockaddr) == 0:
+                return False
+    return True
+
+
+def find_available_port(start_port=5000, max_attempts=100):
+    """
+    Find the lowest free port at or above start_port.
+
+    The whole candidate range is probed concurrently: port probing is
+    I/O-bound (bind + close syscalls), so a thread pool overlaps the
+    latency instead of paying for it serially per port.
+    """
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        futures = {
+            port: executor.submit(is_port_available, port)
+            for port in range(start_port, start_port + max_attempts)
+        }
+        # Collect results in port order so the lowest free port wins, then
+        # cancel whatever is still queued
+        for port, future in futures.items():
+            if future.result():
+                for pending in futures.values():
+                    pending.cancel()
+                return port
+
+    raise RuntimeError(
+        f"No available ports found in range {start_port}-{start_port + max_attempts - 1}"
+    )
+
+
+# psutil.net_connections walks every socket of the requested kind; cache
+# the result for the lifetime of one launcher run, keyed by local port.
+# kind='tcp4' plus the LISTEN filter culls UDP/IPv6 and transient sockets
+# before any Python objects pile up.
+_connections_by_port = None
+
+
+def _get_connections_by_port():
+    global _connections_by_port
+    if _connections_by_port is None:
+        _connections_by_port = {}
+        for conn in psutil.net_connections(kind="tcp4"):
+            if conn.status != psutil.CONN_LISTEN or not conn.laddr:
+                continue
+            _connections_by_port.setdefault(conn.laddr.port, []).append(conn)
+    return _connections_by_port
+
+
+@functools.lru_cache(maxsize=None)
+def _process_name(pid):
+    """Resolve a PID to a process name once; repeat hits skip /proc."""
+    try:
+        return psutil.Process(pid).name()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return "Unknown"
+
+
+def probe_port(port, host="127.0.0.1"):
+    """
+    Check a port and report who holds it in a single pass.
+
+    Returns (is_free, processes); processes is empty when the port is free.
+    """
+    if is_port_available(port, host):
+        return True, []
+    return False, get_processes_using_port(port)
+
+
+def get_processes_using_port(port):
+    """Return info about processes listening on the given port."""
+    processes = []
+
+    if HAS_PSUTIL:
+        for conn in _get_connections_by_port().get(port, []):
+            if conn.pid:
+                processes.append(
+                    {
+                        "pid": conn.pid,
+                        "name": _process_name(conn.pid),
+                        "status": conn.status,
+                    }
+                )
+        return processes
+
+    # Fallback without psutil: parse netstat output (Windows). -p tcp makes
+    # netstat itself skip UDP; the output is streamed line by line in bytes
+    # (no full-buffer decode) and abandoned at the first matching row.
+    if os.name == "nt":
+        # Anchored on the local-address column so a matching port in a
+        # remote address can't produce a false positive
+        pattern = re.compile(
+            rb"^\s*TCP\s+\S+:" + str(port).encode() + rb"\s+\S+\s+LISTENING\s+(\d+)"
+        )
+        try:
+            with subprocess.Popen(
+                ["netstat", "-ano", "-p", "tcp"], stdout=subprocess.PIPE
+            ) as proc:
+                for line in proc.stdout:
+                    match = pattern.match(line)
+                    if match:
+                        processes.append(
+                            {
+                                "pid": match.group(1).decode(),
+                                "name": "Unknown",
+                                "status": "LISTENING",
+                            }
+                        )
+                        break
+                proc.terminate()
+        except (subprocess.SubprocessError, OSError):
+            pass
+    return processes
+
+
+def check_python_version():
+    """Verify the running interpreter is Python 3.9+."""
+    version = sys.version_info
+    if version.major == 3 and version.minor >= 9:
+        colored_print(
+            f"Python {version.major}.{version.minor}.{version.micro} detected", "green"
+        )
+        if version.minor >= 12:
+            colored_print("Python 3.12+ detected.", "yellow")
+        return True
+    colored_print(
+        f"Python 3.9+ required, found {version.major}.{version.minor}.{version.micro}",
+        "red",
+    )
+    return False
+
+
+def check_required_files():
+    """Verify that all project files needed by the dashboard exist."""
+    # One scandir per parent directory instead of one stat per file: a
+    # single dirent read covers every required file in that directory
+    listings = {}
+    for file in REQUIRED_FILES:
+        parent = str(Path(file).parent)
+        if parent not in listings:
+            try:
+                listings[parent] = {entry.name for entry in os.scandir(parent)}
+            except FileNotFoundError:
+                listings[parent] = set()
+
+    all_present = True
+    out = BufferedOutput()
+    for file in REQUIRED_FILES:
+        path = Path(file)
+        if path.name in listings[str(path.parent)]:
+            out.add(f"  Found {file}", "green")
+        else:
+            out.add(f"  Missing {file}", "red")
+            all_present = False
+    out.flush()
+    return all_present
+
+
+def check_matlab(verify=False):
+    """
+    Check that MATLAB is installed.
+
+    Presence is detected via the PATH and the standard install locations —
+    microseconds, versus the multi-second MATLAB startup a batch probe
+    costs. Pass verify=True (--verify-matlab) to actually launch MATLAB
+    and confirm it responds.
+    """
+    colored_print("Checking MATLAB installation...", "cyan")
+
+    matlab_exe = shutil.which("matlab")
+    if matlab_exe is None:
+        # Not on PATH; look in the default install locations
+        for candidate in glob.glob(r"C:\Program Files\MATLAB\R20*\bin\matlab.exe"):
+            matlab_exe = candidate
+            break
+
+    if matlab_exe is None:
+        colored_print("MATLAB not found in PATH or standard install locations", "red")
+        return False
+
+    colored_print(f"Found MATLAB: {matlab_exe}", "green")
+    if not verify:
+        return True
+
+    # Full functional probe, only on request
+    try:
+        result = subprocess.run(
+            [matlab_exe, "-batch", "disp('MATLAB working')"],
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        if "MATLAB working" in result.stdout:
+            colored_print("MATLAB functionality verified", "green")
+            return True
+        colored_print("MATLAB responded but may not be functioning properly", "yellow")
+        return True  # Continue anyway, app.py reports engine errors itself
+    except subprocess.TimeoutExpired:
+        colored_print("MATLAB check timed out, but continuing...", "yellow")
+        return True
+
+
+# System checks (interpreter version, project files, MATLAB presence)
+# rarely change between runs; their outcome is cached on disk for an hour
+# so repeat launches skip the whole probing phase
+SETUP_CACHE_FILE = Path(".setup_cache.json")
+SETUP_CACHE_MAX_AGE_S = 3600
+
+
+def _setup_cache_key():
+    """Key that invalidates the check cache when the environment moves."""
+    return [sys.version, os.stat("requirements.txt").st_mtime, platform.node()]
+
+
+def load_cached_checks():
+    """Report whether a fresh, matching record of passed checks exists."""
+    try:
+        cache = json.loads(SETUP_CACHE_FILE.read_text())
+    except (FileNotFoundError, ValueError):
+        return False
+    return (
+        cache.get("ok") is True
+        and cache.get("key") == _setup_cache_key()
+        and time.time() - cache.get("checked_at", 0) < SETUP_CACHE_MAX_AGE_S
+    )
+
+
+def save_cached_checks():
+    """Record that all system checks passed just now."""
+    try:
+        SETUP_CACHE_FILE.write_text(
+            json.dumps(
+                {"ok": True, "key": _setup_cache_key(), "checked_at": time.time()}
+            )
+        )
+    except OSError:
+        pass  # Caching is best-effort
+
+
+DEPS_STAMP_FILE = Path(".deps_stamp")
+
+
+def install_dependencies():
+    """
+    Install the Python dependencies from requirements.txt.
+
+    A stamp file records the hash of the last successfully installed
+    requirements.txt; when it matches, both pip invocations (resolver runs
+    taking seconds each) are skipped entirely.
+    """
+    digest = hashlib.sha256(Path("requirements.txt").read_bytes()).hexdigest()
+    if DEPS_STAMP_FILE.exists() and DEPS_STAMP_FILE.read_text() == digest:
+        colored_print("Dependencies already up to date (requirements unchanged)", "green")
+        return True
+
+    colored_print("Installing dependencies...", "cyan")
+    try:
+        # Prefer wheels so installs skip per-package PEP 517 source builds;
+        # no pip self-upgrade — one fork/exec fewer, and users who need a
+        # newer pip can upgrade it themselves
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "pip",
+                "install",
+                "--prefer-binary",
+                "--disable-pip-version-check",
+                "--no-input",
+                "-r",
+                "requirements.txt",
+            ],
+            check=True,
+        )
+        DEPS_STAMP_FILE.write_text(digest)
+        colored_print("Dependencies installed successfully", "green")
+        return True
+    except subprocess.CalledProcessError as e:
+        colored_print(f"Failed to install dependencies: {e}", "red")
+        return False
+
+
+def start_application(port, host, no_browser=False):
+    """Start the dashboard and open a browser tab once it is up."""
+    colored_print(f"Starting Smart Grid EV Charging System on port {port}...", "cyan")
+
+    if not no_browser:
+        # The exec below replaces this process, threads included, so the
+        # delayed browser open runs in a small detached helper instead of a
+        # Timer thread
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import sys, time, webbrowser; time.sleep(3); webbrowser.open(sys.argv[1])",
+                f"http://localhost:{port}",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    # Replace the launcher with the server rather than keeping an idle
+    # parent interpreter resident for the server's whole lifetime
+    os.execv(sys.executable, [sys.executable, "app.py", "--port", str(port), "--host", host])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Smart Grid-Integrated EV Charging System setup script"
+    )
+    parser.add_argument(
+        "--port", type=int, default=5000, help="Port to run the server on (default: 5000)"
+    )
+    parser.add_argument(
+        "--host", type=str, default="0.0.0.0", help="Host to bind to (default: 0.0.0.0)"
+    )
+    parser.add_argument(
+        "--skip-install", action="store_true", help="Skip Python package installation"
+    )
+    parser.add_argument(
+        "--quick-start",
+        action="store_true",
+        help="Skip dependency checks (MATLAB) and start immediately",
+    )
+    parser.add_argument(
+        "--no-browser", action="store_true", help="Do not open a browser tab"
+    )
+    parser.add_argument(
+        "--verify-matlab",
+        action="store_true",
+        help="Launch MATLAB to verify it responds (slow) instead of just locating it",
+    )
+    parser.add_argument(
+        "--force-check",
+        action="store_true",
+        help="Re-run system checks even when a fresh cached result exists",
+    )
+    args = parser.parse_args()
+
+    colored_print("Smart Grid-Integrated EV Charging System", "magenta")
+    os.chdir(Path(__file__).resolve().parent)
+    colored_print(f"Working directory: {os.getcwd()}", "cyan")
+
+    # Python version, project files and MATLAB presence rarely change; a
+    # fresh cached pass skips the whole probing phase
+    checks_cached = not args.force_check and load_cached_checks()
+    if checks_cached:
+        colored_print("System checks OK (cached)", "green")
+    else:
+        colored_print("Performing system checks...", "cyan")
+
+        if not check_python_version():
+            sys.exit(1)
+
+        if not check_required_files():
+            colored_print("Required project files are missing", "red")
+            sys.exit(1)
+
+    # Check port availability, falling back to the next free one. Probe
+    # localhost (both loopback families) when binding to all interfaces.
+    probe_host = "localhost" if args.host in ("0.0.0.0", "::", "") else args.host
+    port = args.port
+    is_free, offenders = probe_port(port, probe_host)
+    if not is_free:
+        colored_print(f"Port {port} is not available", "yellow")
+        for proc in offenders:
+            colored_print(
+                f"  In use by {proc['name']} (pid {proc['pid']}, {proc['status']})",
+                "yellow",
+            )
+        try:
+            # The requested port was just checked; start the search above it
+            port = find_available_port(port + 1)
+            colored_print(f"Found available port: {port}", "cyan")
+        except RuntimeError as e:
+            colored_print(str(e), "red")
+            sys.exit(1)
+    else:
+        colored_print(f"Port {port} is available", "green")
+
+    if not checks_cached:
+        if not args.quick_start:
+            if not check_matlab(verify=args.verify_matlab):
+                colored_print(
+                    "MATLAB check failed. The system requires MATLAB for Simulink models.",
+                    "red",
+                )
+                colored_print(
+                    "Use --quick-start to skip this check if MATLAB is not needed now.",
+                    "cyan",
+                )
+                sys.exit(1)
+            save_cached_checks()
+
+    if not args.skip_install:
+        if not install_dependencies():
+            sys.exit(1)
+
+    colored_print("Setup completed successfully!", "green")
+    start_application(port, args.host, no_browser=args.no_browser)
+
+
+if __name__ == "__main__":
+    main()
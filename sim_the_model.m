@@ -19,7 +19,10 @@ function res = sim_the_model(args)
 %    run with the default values set in the model.
 %
 % Outputs:
-%    res: A structure with the time and data values of the logged signals.
+%    res: A structure with the time and data values of the logged signals,
+%       or, when ReturnMatrix is true, one N-by-9 double matrix with the
+%       columns [Time, Batt, BattRecharge, EVRecharge, GridRequest,
+%       Vehicle1..4BatteryLevel].
 
 % By: Murali Yeddanapudi, 20-Feb-2022
 
@@ -31,6 +34,7 @@ arguments
     args.InputFcn (1,1) {mustBeFunctionHandle} = @emptyFunction
     args.OutputFcn (1,1)  {mustBeFunctionHandle} = @emptyFunction
     args.OutputFcnDecimation (1,1) {mustBeInteger, mustBePositive} = 1
+    args.ReturnMatrix (1,1) {mustBeNumericOrLogical} = false
 end
 
 %% Create the SimulationInput object
@@ -43,6 +47,11 @@ if ~isnan(args.StopTime)
 end
 
 %% Load the specified tunable parameters into the simulation input object
+if isstruct(args.TunableParameters) && isfield(args.TunableParameters, 'BoolMask')
+    % The Python side packs the 0/1 flags into one bitmask and the bay
+    % percentages into one vector to shrink the marshalled struct
+    args.TunableParameters = unpackTunableParameters(args.TunableParameters);
+end
 if isstruct(args.TunableParameters)
     tpNames = fieldnames(args.TunableParameters);
     for itp = 1:numel(tpNames)
@@ -99,11 +108,64 @@ end
 so = sim(si);
 
 %% Extract the simulation results
-% Package the time and data values of the logged signals into a structure
-res = extractResults(so,nan);
+if args.ReturnMatrix
+    % Package everything into one double matrix so the whole result
+    % crosses the engine boundary as a single bulk transfer
+    res = packResultsMatrix(so);
+else
+    % Package the time and data values of the logged signals into a structure
+    res = extractResults(so,nan);
+end
 
 end % sim_Prototype_using_matlab_runtime
 
+function res = packResultsMatrix(so)
+% Pack the logged signals into an N-by-9 double matrix with the fixed
+% column order [Time, Batt, BattRecharge, EVRecharge, GridRequest,
+% Vehicle1..4BatteryLevel]. Missing signals are left as NaN columns.
+sigNames = {'Batt', 'BattRecharge', 'EVRecharge', 'GridRequest', ...
+    'Vehicle1BatteryLevel', 'Vehicle2BatteryLevel', ...
+    'Vehicle3BatteryLevel', 'Vehicle4BatteryLevel'};
+ts = simulink.compiler.internal.extractTimeseriesFromDataset(so.logsout);
+byName = containers.Map();
+for its=1:numel(ts)
+    byName(ts{its}.Name) = its;
+end
+% Use Batt's time base, matching the Python parser's default time key
+if ~isKey(byName, 'Batt')
+    res = zeros(0, 9);
+    return
+end
+t = ts{byName('Batt')}.Time(:);
+n = numel(t);
+res = nan(n, 9);
+res(:,1) = t;
+for ic = 1:numel(sigNames)
+    if isKey(byName, sigNames{ic})
+        d = ts{byName(sigNames{ic})}.Data(:);
+        m = min(n, numel(d));
+        res(1:m, ic+1) = d(1:m);
+    end
+end
+end
+
+function tp = unpackTunableParameters(packed)
+% Expand the compact parameter struct sent by the Python side back into
+% the individual workspace variables the model expects. Fields outside
+% the packed sets pass through unchanged.
+tp = rmfield(packed, {'BoolMask', 'BayPercentages'});
+boolNames = {'bay1_occupied', 'bay2_occupied', 'bay3_occupied', ...
+    'bay4_occupied', 'GridPeak'};
+for ib = 1:numel(boolNames)
+    tp.(boolNames{ib}) = double(bitand(packed.BoolMask, 2^(ib-1)) ~= 0);
+end
+pctNames = {'bay1_percentage', 'bay2_percentage', ...
+    'bay3_percentage', 'bay4_percentage'};
+for ip = 1:numel(pctNames)
+    tp.(pctNames{ip}) = packed.BayPercentages(ip);
+end
+end
+
 function res = extractResults(so, prevSimTime)
 % Package the time and data values of the logged signals into a structure
 ts = simulink.compiler.internal.extractTimeseriesFromDataset(so.logsout);
@@ -4,14 +4,33 @@ This module provides functionality to start/stop the MATLAB engine,
 run simulations, and extract/process results.
 """
 
+import atexit
+import hashlib
 import logging
 import matlab.engine
+import numpy as np
 import os
+import queue
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from dataclasses import dataclass
 from typing import Dict, Any, List, Optional, Union, Iterator, NamedTuple, Tuple
 
+# Use numba for JIT-compiled result filtering if available (optional dependency)
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Use pandas for columnar Feather export if available (optional dependency)
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,65 +43,381 @@ logger = logging.getLogger("matlab_simulation")
 SIMULATION_STOP_TIME_S = 50
 DEFAULT_SIMULATION_SPEED = 1.0
 SIMULATION_MODEL_NAME = "CompleteV1"
+RESULTS_CACHE_MAX_ENTRIES = 128
+RESULTS_CACHE_DIR = ".simcache"
 
 # --- Data Structures ---
-@dataclass
 class SimulationParameters:
-    """Represents parameters for the simulation."""
-
-    bay1_occupied: float = 0.0  # boolean (0.0/1.0)
-    bay2_occupied: float = 0.0  # boolean (0.0/1.0)
-    bay3_occupied: float = 0.0  # boolean (0.0/1.0)
-    bay4_occupied: float = 0.0  # boolean (0.0/1.0)
-    bay1_percentage: float = 0.0  # percentage (0.0-100.0)
-    bay2_percentage: float = 0.0  # percentage (0.0-100.0)
-    bay3_percentage: float = 0.0  # percentage (0.0-100.0)
-    bay4_percentage: float = 0.0  # percentage (0.0-100.0)
-    PVOutput: float = 10.0  # kW per hour (DC)
-    battery_soc: float = 0.0  # percentage (0.0-100.0)
-    GridPeak: float = 0.0  # boolean (0.0/1.0) - Peak time indicator for grid pricing
-    BatteryOutput: float = 30.0  # kW
+    """Represents parameters for the simulation.
+
+    Per-bay state is stored structure-of-arrays style in small NumPy
+    vectors (index 0 = bay 1) so persistence updates across all four
+    bays collapse into single vector operations. The familiar scalar
+    names (``bay1_percentage``, ``_user_set_bay3_percentage``, ...) are
+    property shims over those vectors, so existing callers and the
+    Flask handlers keep working unchanged.
+    """
+
+    __slots__ = (
+        "_bay_occupied",
+        "_bay_percentage",
+        "_user_set_occupied",
+        "_user_set_percentage",
+        "PVOutput",
+        "battery_soc",
+        "GridPeak",
+        "BatteryOutput",
+        "_user_set_battery_soc",
+        "_preserve_pv_state",
+    )
+
+    def __init__(
+        self,
+        bay1_occupied: float = 0.0,  # boolean (0.0/1.0)
+        bay2_occupied: float = 0.0,  # boolean (0.0/1.0)
+        bay3_occupied: float = 0.0,  # boolean (0.0/1.0)
+        bay4_occupied: float = 0.0,  # boolean (0.0/1.0)
+        bay1_percentage: float = 0.0,  # percentage (0.0-100.0)
+        bay2_percentage: float = 0.0,  # percentage (0.0-100.0)
+        bay3_percentage: float = 0.0,  # percentage (0.0-100.0)
+        bay4_percentage: float = 0.0,  # percentage (0.0-100.0)
+        PVOutput: float = 10.0,  # kW per hour (DC)
+        battery_soc: float = 0.0,  # percentage (0.0-100.0)
+        GridPeak: float = 0.0,  # boolean (0.0/1.0) - Peak time indicator for grid pricing
+        BatteryOutput: float = 30.0,  # kW
+    ) -> None:
+        self._bay_occupied = np.array(
+            [bay1_occupied, bay2_occupied, bay3_occupied, bay4_occupied],
+            dtype=np.float64,
+        )
+        self._bay_percentage = np.array(
+            [bay1_percentage, bay2_percentage, bay3_percentage, bay4_percentage],
+            dtype=np.float64,
+        )
+        # Dashboard bookkeeping flags (not tunable model parameters)
+        self._user_set_occupied = np.zeros(4, dtype=np.bool_)
+        self._user_set_percentage = np.zeros(4, dtype=np.bool_)
+        self._user_set_battery_soc = False
+        self._preserve_pv_state = False
+        self.PVOutput = PVOutput
+        self.battery_soc = battery_soc
+        self.GridPeak = GridPeak
+        self.BatteryOutput = BatteryOutput
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={getattr(self, name)}" for name in _PARAMETER_FIELDS
+        )
+        return f"{type(self).__name__}({fields})"
 
     def to_dict(self) -> Dict[str, float]:
-        """Convert parameters to a dictionary."""
-        return {field: getattr(self, field) for field in self.__dataclass_fields__}
+        """Convert parameters to a dictionary of tunable fields only."""
+        # The bookkeeping flags must not leak into the tunable-parameter
+        # dict handed to MATLAB
+        return {field: getattr(self, field) for field in _PARAMETER_FIELDS}
+
+    @property
+    def bay_occupied(self) -> np.ndarray:
+        """Occupancy of bays 1-4 as a writable float64 vector."""
+        return self._bay_occupied
+
+    @property
+    def bay_percentages(self) -> np.ndarray:
+        """Charge percentages of bays 1-4 as a writable float64 vector."""
+        return self._bay_percentage
+
+    @property
+    def user_set(self) -> np.ndarray:
+        """Per-bay user-set percentage flags as a writable bool vector."""
+        return self._user_set_percentage
+
+    @property
+    def user_set_mask(self) -> int:
+        """Bay-percentage user-set flags packed as bits 0-3 for bays 1-4.
+
+        Lets callers snapshot all four flags with one attribute read and
+        test a bay with ``mask & (1 << (bay - 1))`` instead of four
+        hasattr/getattr round trips.
+        """
+        mask = 0
+        for bit in range(4):
+            if self._user_set_percentage[bit]:
+                mask |= 1 << bit
+        return mask
+
+    def apply_bay_levels(self, levels: np.ndarray) -> None:
+        """Store simulated bay levels where the user has not pinned a value.
+
+        ``levels`` holds one value per bay; NaN entries (no data for
+        that bay) are skipped. The whole update is a single vector store
+        so callers hold the lock for one C-level operation.
+        """
+        levels = np.asarray(levels, dtype=np.float64)
+        np.copyto(
+            self._bay_percentage,
+            levels,
+            where=~self._user_set_percentage & ~np.isnan(levels),
+        )
+
+
+def _bay_scalar_shim(array_attr: str, index: int, cast: type) -> property:
+    """Build a scalar property over one slot of a per-bay vector."""
+
+    def _get(self):
+        return cast(getattr(self, array_attr)[index])
+
+    def _set(self, value):
+        getattr(self, array_attr)[index] = value
+
+    def _del(self):
+        # Callers "clear" a flag with delattr; the vector slot just
+        # drops back to its zero value
+        getattr(self, array_attr)[index] = 0
+
+    return property(_get, _set, _del)
+
+
+for _bay_index in range(4):
+    _bay = _bay_index + 1
+    setattr(
+        SimulationParameters,
+        f"bay{_bay}_occupied",
+        _bay_scalar_shim("_bay_occupied", _bay_index, float),
+    )
+    setattr(
+        SimulationParameters,
+        f"bay{_bay}_percentage",
+        _bay_scalar_shim("_bay_percentage", _bay_index, float),
+    )
+    setattr(
+        SimulationParameters,
+        f"_user_set_bay{_bay}_occupied",
+        _bay_scalar_shim("_user_set_occupied", _bay_index, bool),
+    )
+    setattr(
+        SimulationParameters,
+        f"_user_set_bay{_bay}_percentage",
+        _bay_scalar_shim("_user_set_percentage", _bay_index, bool),
+    )
+del _bay_index, _bay
+
+
+# 0/1 flags packed into one bitmask for the engine call (bit i = field i)
+_PACKED_BOOL_FIELDS = (
+    "bay1_occupied",
+    "bay2_occupied",
+    "bay3_occupied",
+    "bay4_occupied",
+    "GridPeak",
+)
+# Percentages shipped as a single vector instead of four scalar fields
+_PACKED_PERCENTAGE_FIELDS = (
+    "bay1_percentage",
+    "bay2_percentage",
+    "bay3_percentage",
+    "bay4_percentage",
+)
+
+
+def _pack_tunable_parameters(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Pack the tunable-parameter dict into the compact engine payload.
+
+    The five 0/1 flags travel as one bitmask and the four bay
+    percentages as one vector, shrinking the marshalled struct from
+    twelve scalar fields to five; sim_the_model.m expands them back into
+    the individual workspace variables the model expects. Fields outside
+    the packed sets pass through unchanged.
+    """
+    packed = dict(params)
+    mask = 0
+    for bit, name in enumerate(_PACKED_BOOL_FIELDS):
+        if packed.pop(name, 0.0):
+            mask |= 1 << bit
+    packed["BoolMask"] = float(mask)
+    packed["BayPercentages"] = matlab.double(
+        [float(packed.pop(name, 0.0)) for name in _PACKED_PERCENTAGE_FIELDS]
+    )
+    return packed
+
+
+# Baked once at import; to_dict is on the hot path before every MATLAB call
+_PARAMETER_FIELDS = (
+    "bay1_occupied",
+    "bay2_occupied",
+    "bay3_occupied",
+    "bay4_occupied",
+    "bay1_percentage",
+    "bay2_percentage",
+    "bay3_percentage",
+    "bay4_percentage",
+    "PVOutput",
+    "battery_soc",
+    "GridPeak",
+    "BatteryOutput",
+)
 
 
 class SimulationResults(NamedTuple):
-    """Container for processed simulation results."""
-
-    time_vector: List[float]
-    batt_values: List[float]
-    batt_recharge: List[float]
-    ev_recharge: List[float]
-    grid_request: List[float]
-    vehicle1_battery_level: List[float]
-    vehicle2_battery_level: List[float]
-    vehicle3_battery_level: List[float]
-    vehicle4_battery_level: List[float]
+    """Container for processed simulation results (parallel float64 arrays)."""
+
+    time_vector: np.ndarray
+    batt_values: np.ndarray
+    batt_recharge: np.ndarray
+    ev_recharge: np.ndarray
+    grid_request: np.ndarray
+    vehicle1_battery_level: np.ndarray
+    vehicle2_battery_level: np.ndarray
+    vehicle3_battery_level: np.ndarray
+    vehicle4_battery_level: np.ndarray
 
     @property
     def data_length(self) -> int:
         """Returns the length of the time vector."""
-        return len(self.time_vector) if self.time_vector else 0
+        return len(self.time_vector)
+
+    def to_npz(self, path: str) -> None:
+        """Persist the result arrays as a compressed NumPy .npz archive."""
+        np.savez_compressed(path, **self._asdict())
+
+    def to_feather(self, path: str) -> None:
+        """
+        Persist the results as a columnar Feather file for zero-copy reload.
+
+        Requires pandas (with pyarrow); raises RuntimeError otherwise.
+        """
+        if not HAS_PANDAS:
+            raise RuntimeError("pandas with pyarrow is required for Feather export")
+        pd.DataFrame(self._asdict()).to_feather(path)
+
+    def summarize(self) -> "ResultsSummary":
+        """Reduces the result arrays to a small scalar digest."""
+        n_samples = len(self.time_vector)
+        return ResultsSummary(
+            n_samples=n_samples,
+            t_min=float(self.time_vector[0]) if n_samples else 0.0,
+            t_max=float(self.time_vector[-1]) if n_samples else 0.0,
+            all_zero_batt=bool((np.abs(self.batt_values) < 1e-10).all()),
+            all_zero_ev=bool((np.abs(self.ev_recharge) < 1e-10).all()),
+            any_nonzero_grid=bool((np.abs(self.grid_request) > 1e-10).any()),
+        )
+
+
+class ResultsSummary(NamedTuple):
+    """Scalar digest of a result set for callers that only need reductions."""
+
+    n_samples: int
+    t_min: float
+    t_max: float
+    all_zero_batt: bool
+    all_zero_ev: bool
+    any_nonzero_grid: bool
 
 
 # --- Helper Functions ---
+def _keep_mask_kernel(t: np.ndarray, arr: np.ndarray) -> np.ndarray:
+    """
+    Single-pass keep mask for _filter_zero_datapoints.
+
+    t is the (n,) time vector and arr the stacked (8, n) data matrix with
+    rows 1..3 holding the activity signals. Written as a plain loop so
+    numba can compile it without temporary arrays; NaN values count
+    neither as activity nor as a nonzero value (NaN != NaN).
+    """
+    n = t.shape[0]
+    keep = np.empty(n, dtype=np.bool_)
+    for i in range(n):
+        if t[i] > 1.0:
+            keep[i] = True
+            continue
+        has_activity = False
+        for j in range(1, 4):
+            value = arr[j, i]
+            if value == value and abs(value) > 1e-10:
+                has_activity = True
+                break
+        all_zero = True
+        for j in range(8):
+            value = arr[j, i]
+            if value == value and abs(value) >= 1e-10:
+                all_zero = False
+                break
+        keep[i] = has_activity and not all_zero
+    return keep
+
+
+if HAS_NUMBA:
+    _keep_mask_kernel = njit(cache=True)(_keep_mask_kernel)
+
+
 def _handle_exception(exc: Exception, message: str) -> None:
     """Helper function to log exceptions."""
-    logger.error(f"{message}: {exc}")
+    logger.error("%s: %s", message, exc)
     if logging.getLogger().level <= logging.DEBUG:
         logger.exception("Detailed traceback:")
 
 
+def _quantize_stop_time(stop_time: Union[int, float]) -> float:
+    """Rounds the stop time to a whole second (minimum 1).
+
+    Simulink builds a distinct time grid for every distinct float stop
+    time, so fractional jitter would defeat the result caches and the
+    time-grid memoization; quantizing keeps the keys and the grid
+    stable across calls.
+    """
+    return float(max(1, int(round(float(stop_time)))))
+
+
+def _matlab_to_ndarray(data: Any) -> np.ndarray:
+    """Converts a MATLAB double array to a float64 ndarray, zero-copy when possible.
+
+    matlab.double keeps its payload in a flat ``array.array('d')``
+    exposed as ``_data``; viewing that buffer with np.frombuffer skips
+    the per-element __getitem__ crossings of the proxy object. MATLAB
+    stores column-major, so multi-dimensional arrays are reshaped with
+    Fortran order. Anything without the private buffer falls back to
+    the regular np.asarray conversion.
+    """
+    try:
+        raw = data._data
+        size = data.size
+    except AttributeError:
+        return np.asarray(data, dtype=np.float64)
+
+    if getattr(raw, "typecode", None) == "d":
+        arr = np.frombuffer(raw, dtype=np.float64)
+    else:
+        arr = np.asarray(raw, dtype=np.float64)
+    if len(size) > 1:
+        arr = arr.reshape(tuple(size), order="F")
+    return arr
+
+
 # --- Main Classes ---
 class ResultsParser:
     """Responsible for parsing and extracting data from MATLAB simulation results."""
 
+    # Converted time grids keyed by (length, first, last). With a fixed
+    # stop time and solver the grid is identical across runs, so the
+    # bulk conversion of the Time array only has to happen once.
+    _time_grid_cache: Dict[Tuple[int, float, float], np.ndarray] = {}
+    _TIME_GRID_CACHE_MAX_ENTRIES = 4
+
+    # Result keys in SimulationResults field order (after time_vector)
+    _SERIES_KEYS = (
+        "Batt",
+        "BattRecharge",
+        "EVRecharge",
+        "GridRequest",
+        "Vehicle1BatteryLevel",
+        "Vehicle2BatteryLevel",
+        "Vehicle3BatteryLevel",
+        "Vehicle4BatteryLevel",
+    )
+
     @staticmethod
     def extract_time_vector(
         result: Dict[str, Any], time_key: str = "Batt"
-    ) -> Optional[List[float]]:
+    ) -> Optional[np.ndarray]:
         """
         Extracts the time vector from the result, assuming it's present and consistent.
 
@@ -91,241 +426,282 @@ class ResultsParser:
             time_key: Key in results that contains the time vector
 
         Returns:
-            List of time values or None if extraction fails
+            Array of time values or None if extraction fails
         """
         if (
             time_key not in result
             or not isinstance(result[time_key], dict)
             or "Time" not in result[time_key]
         ):
-            logger.warning(f"Could not find time vector using key '{time_key}'.")
+            logger.warning("Could not find time vector using key '%s'.", time_key)
             return None
 
         time_data = result[time_key]["Time"]
-        extracted_times = []
         try:
             # Check if time_data is iterable and not empty
             if not hasattr(time_data, "__iter__"):
                 raise ValueError("Time data is not iterable")
 
-            if not time_data:
-                logger.warning(f"Time vector for key '{time_key}' is empty.")
-                return []  # Return empty list
-
-            # Extract all data points
-            for item in time_data:
-                # Check if item is indexable and has at least one element
-                if not hasattr(item, "__getitem__") or len(item) < 1:
-                    raise ValueError(f"Invalid item format in time data: {item}")
-                # Try converting the first element to float
-                extracted_times.append(float(item[0]))
-                
-            logger.info(f"Extracted {len(extracted_times)} time points")
+            if not len(time_data):
+                logger.warning("Time vector for key '%s' is empty.", time_key)
+                return np.empty(0, dtype=np.float64)  # Return empty array
+
+            # Probe three scalars to identify a grid seen before; repeat
+            # runs with the same stop time reuse the converted array
+            cache = ResultsParser._time_grid_cache
+            try:
+                signature = (
+                    len(time_data),
+                    float(time_data[0][0]),
+                    float(time_data[-1][0]),
+                )
+            except (TypeError, IndexError):
+                signature = None
+            if signature is not None and signature in cache:
+                # Copy so downstream consumers can never alias the cache
+                return cache[signature].copy()
+
+            # View the MATLAB (N, 1) array's buffer directly instead of
+            # converting element by element through the proxy
+            arr = _matlab_to_ndarray(time_data)
+            extracted_times = arr[:, 0] if arr.ndim == 2 else arr.ravel()
+
+            if signature is not None:
+                if len(cache) >= ResultsParser._TIME_GRID_CACHE_MAX_ENTRIES:
+                    cache.pop(next(iter(cache)))
+                cache[signature] = extracted_times.copy()
+
+            logger.info("Extracted %d time points", len(extracted_times))
             return extracted_times
 
         except (TypeError, ValueError, IndexError) as e:
             logger.warning(
-                f"Unexpected format or error processing time vector for key '{time_key}'. "
-                f"Data: {time_data}. Error: {e}"
+                "Unexpected format or error processing time vector for key '%s'. "
+                "Data: %s. Error: %s",
+                time_key,
+                time_data,
+                e,
             )
             return None
 
     @staticmethod
     def extract_data_from_result(
         result: Dict[str, Any], key: str, expected_length: Optional[int] = None
-    ) -> Optional[List[float]]:
+    ) -> Optional[np.ndarray]:
         """
         Safely extracts time series data from the MATLAB result structure.
 
         Args:
             result: The raw simulation results dictionary from MATLAB
             key: The key to extract data for
-            expected_length: Expected length of the output data list
+            expected_length: Expected length of the output data array
 
         Returns:
-            List of data values or None if extraction fails
+            Array of data values or None if extraction fails
         """
         if key not in result:
-            logger.warning(f"Key '{key}' not found in result.")
+            logger.warning("Key '%s' not found in result.", key)
             return None
 
         data_item = result[key]
 
         if isinstance(data_item, dict) and "Data" in data_item:
             data_list = data_item["Data"]
-            extracted_data = []
             try:
                 # Check if data_list is iterable
                 if not hasattr(data_list, "__iter__"):
                     raise ValueError("Data list is not iterable")
 
                 # Allow empty list if expected_length is 0 or None initially
-                if not data_list and expected_length is not None and expected_length > 0:
+                if not len(data_list) and expected_length is not None and expected_length > 0:
                     raise ValueError("Data list is unexpectedly empty")
 
-                # Process all data points
-                for item in data_list:
-                    # Check if item is indexable and has at least one element
-                    if not hasattr(item, "__getitem__") or len(item) < 1:
-                        raise ValueError(
-                            f"Invalid item format in data list for key '{key}': {item}"
-                        )
-                    # Try converting the first element to float
-                    extracted_data.append(float(item[0]))
+                # View the MATLAB (N, 1) array's buffer directly instead of
+                # converting element by element through the proxy
+                arr = _matlab_to_ndarray(data_list)
+                if arr.ndim == 2:
+                    arr = arr[:, 0]
+                else:
+                    arr = arr.ravel()
 
-                logger.info(f"Extracted {len(extracted_data)} data points for key '{key}'")
+                logger.info("Extracted %d data points for key '%s'", len(arr), key)
 
                 # Check length after successful extraction
-                if expected_length is not None and len(extracted_data) != expected_length:
+                if expected_length is not None and len(arr) != expected_length:
                     logger.warning(
-                        f"Data length mismatch for key '{key}'. Expected {expected_length}, "
-                        f"got {len(extracted_data)}."
+                        "Data length mismatch for key '%s'. Expected %d, got %d.",
+                        key,
+                        expected_length,
+                        len(arr),
                     )
-                    # Pad or truncate with NaNs to match expected length
-                    if len(extracted_data) < expected_length:
-                        extracted_data.extend(
-                            [float("nan")] * (expected_length - len(extracted_data))
-                        )
-                    else:
-                        extracted_data = extracted_data[:expected_length]  # Truncate if too long
+                    # Normalize into one preallocated NaN buffer instead of
+                    # concatenating (pad) or re-slicing (truncate)
+                    normalized = np.full(expected_length, np.nan)
+                    copy_length = min(len(arr), expected_length)
+                    normalized[:copy_length] = arr[:copy_length]
+                    arr = normalized
 
-                return extracted_data
+                return arr
 
             except (TypeError, ValueError, IndexError) as e:
                 logger.warning(
-                    f"Unexpected format or error processing data for key '{key}'. "
-                    f"Data: {data_list}. Error: {e}"
+                    "Unexpected format or error processing data for key '%s'. "
+                    "Data: %s. Error: %s",
+                    key,
+                    data_list,
+                    e,
                 )
                 # Return NaNs of expected length if extraction fails and length is known
                 return (
-                    [float("nan")] * expected_length
+                    np.full(expected_length, np.nan)
                     if expected_length is not None
                     else None
                 )
 
         elif isinstance(data_item, (int, float)):  # Handle single value case
             logger.warning(
-                f"Key '{key}' returned a single value, not time series. Value: {data_item}"
+                "Key '%s' returned a single value, not time series. Value: %s",
+                key,
+                data_item,
             )
             # Cannot determine length, return None
             return None
 
         else:  # Handle other unexpected types
             logger.warning(
-                f"Unexpected data type or structure for key '{key}'. Type: {type(data_item)}"
+                "Unexpected data type or structure for key '%s'. Type: %s",
+                key,
+                type(data_item),
             )
             # Return NaNs of expected length if known
-            return [float("nan")] * expected_length if expected_length is not None else None
+            return np.full(expected_length, np.nan) if expected_length is not None else None
 
     @staticmethod
     def _filter_zero_datapoints(
-        time_vector: List[float],
-        batt_values: List[float],
-        batt_recharge: List[float],
-        ev_recharge: List[float],
-        grid_request: List[float],
-        vehicle1_battery_level: List[float],
-        vehicle2_battery_level: List[float],
-        vehicle3_battery_level: List[float],
-        vehicle4_battery_level: List[float],
-    ) -> Tuple[List[float], List[float], List[float], List[float], List[float], 
-               List[float], List[float], List[float], List[float]]:
+        time_vector: np.ndarray,
+        batt_values: np.ndarray,
+        batt_recharge: np.ndarray,
+        ev_recharge: np.ndarray,
+        grid_request: np.ndarray,
+        vehicle1_battery_level: np.ndarray,
+        vehicle2_battery_level: np.ndarray,
+        vehicle3_battery_level: np.ndarray,
+        vehicle4_battery_level: np.ndarray,
+    ) -> SimulationResults:
         """
         Filters out simulation startup artifacts and meaningless data points.
-        
+
         This method removes:
         1. Time points where all activity values (non-state values) are zero
         2. Early time points (t=0, t=1) that represent simulation initialization
            when no meaningful activity is occurring
-        
+
         Args:
             time_vector: Time points
-            All data series as separate lists
-            
+            All data series as separate arrays, already padded to the
+            time-vector length by parse_simulation_results
+
         Returns:
-            Tuple of filtered lists (time_vector, all data series)
+            SimulationResults holding the filtered arrays
         """
-        if not time_vector:
-            return ([], [], [], [], [], [], [], [], [])
-            
-        # Create lists to store filtered data
-        filtered_time = []
-        filtered_batt = []
-        filtered_batt_recharge = []
-        filtered_ev_recharge = []
-        filtered_grid_request = []
-        filtered_vehicle1 = []
-        filtered_vehicle2 = []
-        filtered_vehicle3 = []
-        filtered_vehicle4 = []
-        
-        zero_points_removed = 0
-        
-        # Check each data point
-        for i in range(len(time_vector)):
-            time_val = time_vector[i]
-            
-            # Get activity values (values that indicate actual system activity)
-            # These exclude static state values like initial battery levels
-            activity_values = [
-                batt_recharge[i] if i < len(batt_recharge) else 0,
-                ev_recharge[i] if i < len(ev_recharge) else 0,
-                grid_request[i] if i < len(grid_request) else 0,
-            ]
-            
-            # Get all data values for complete check
-            all_data_values = [
-                batt_values[i] if i < len(batt_values) else 0,
-                batt_recharge[i] if i < len(batt_recharge) else 0,
-                ev_recharge[i] if i < len(ev_recharge) else 0,
-                grid_request[i] if i < len(grid_request) else 0,
-                vehicle1_battery_level[i] if i < len(vehicle1_battery_level) else 0,
-                vehicle2_battery_level[i] if i < len(vehicle2_battery_level) else 0,
-                vehicle3_battery_level[i] if i < len(vehicle3_battery_level) else 0,
-                vehicle4_battery_level[i] if i < len(vehicle4_battery_level) else 0,
-            ]
-            
-            # Filtering logic:
-            # 1. Always keep if time > 1.0 (meaningful simulation time)
-            # 2. For t <= 1.0, filter out if no meaningful activity is occurring
-            should_keep = True
-            
-            if time_val <= 1.0:  # Early simulation time
-                # Check if there's any meaningful activity
-                has_activity = any(abs(value) > 1e-10 for value in activity_values 
-                                 if not (isinstance(value, float) and value != value))  # Exclude NaN
-                
-                # Also check if ALL values are zero (original strict condition)
-                all_zero = all(abs(value) < 1e-10 for value in all_data_values 
-                             if not (isinstance(value, float) and value != value))  # Exclude NaN
-                
-                # Filter out if no activity AND (all zero OR just initialization)
-                if not has_activity or all_zero:
-                    should_keep = False
-            
-            if should_keep:
-                # Keep this data point
-                filtered_time.append(time_vector[i])
-                filtered_batt.append(batt_values[i] if i < len(batt_values) else float("nan"))
-                filtered_batt_recharge.append(batt_recharge[i] if i < len(batt_recharge) else float("nan"))
-                filtered_ev_recharge.append(ev_recharge[i] if i < len(ev_recharge) else float("nan"))
-                filtered_grid_request.append(grid_request[i] if i < len(grid_request) else float("nan"))
-                filtered_vehicle1.append(vehicle1_battery_level[i] if i < len(vehicle1_battery_level) else float("nan"))
-                filtered_vehicle2.append(vehicle2_battery_level[i] if i < len(vehicle2_battery_level) else float("nan"))
-                filtered_vehicle3.append(vehicle3_battery_level[i] if i < len(vehicle3_battery_level) else float("nan"))
-                filtered_vehicle4.append(vehicle4_battery_level[i] if i < len(vehicle4_battery_level) else float("nan"))
-            else:
-                zero_points_removed += 1
-        
-        if zero_points_removed > 0:
-            logger.info(f"Filtered out {zero_points_removed} startup/inactive data points")
-        
-        return (
-            filtered_time, filtered_batt, filtered_batt_recharge, 
-            filtered_ev_recharge, filtered_grid_request, filtered_vehicle1,
-            filtered_vehicle2, filtered_vehicle3, filtered_vehicle4
+        if not len(time_vector):
+            empty = np.empty(0, dtype=np.float64)
+            return SimulationResults(
+                **{name: empty for name in SimulationResults._fields}
+            )
+
+        n = len(time_vector)
+        t = np.asarray(time_vector, dtype=np.float64)
+
+        # Stack the 8 data series into one (8, n) matrix; row order matters:
+        # rows 1..3 (batt_recharge, ev_recharge, grid_request) are the
+        # activity signals that indicate actual system activity, the rest
+        # are state values like battery levels. The extractors guarantee
+        # every series is length n, so no per-series pad guards are needed.
+        arr = np.asarray(
+            [
+                batt_values,
+                batt_recharge,
+                ev_recharge,
+                grid_request,
+                vehicle1_battery_level,
+                vehicle2_battery_level,
+                vehicle3_battery_level,
+                vehicle4_battery_level,
+            ],
+            dtype=np.float64,
         )
 
+        # Only points in the t <= 1.0 initialization prefix can ever be
+        # dropped; the time vector is monotonic, so one binary search
+        # bounds the region the filter has to look at
+        split = int(np.searchsorted(t, 1.0, side="right"))
+        if split == 0:
+            # Whole result is past the initialization window
+            filtered = dict(zip(SimulationResults._fields[1:], arr))
+            return SimulationResults(time_vector=t, **filtered)
+
+        # Filtering logic:
+        # 1. Always keep if time > 1.0 (meaningful simulation time)
+        # 2. For t <= 1.0, filter out if no meaningful activity is occurring
+        if HAS_NUMBA:
+            # Compiled single-pass kernel, no temporary arrays
+            keep_prefix = _keep_mask_kernel(t[:split], arr[:, :split])
+        else:
+            # fmax.reduce ignores NaN natively (and, unlike nanmax, is
+            # silent on all-NaN columns), so NaN values contribute neither
+            # activity nor a nonzero value; NaN peaks compare False below
+            magnitudes = np.abs(arr[:, :split])
+            activity_peak = np.fmax.reduce(magnitudes[1:4], axis=0)
+            overall_peak = np.fmax.reduce(magnitudes, axis=0)
+            has_activity = activity_peak > 1e-10
+            all_zero = ~(overall_peak >= 1e-10)
+            keep_prefix = has_activity & ~all_zero
+
+        keep = np.ones(n, dtype=np.bool_)
+        keep[:split] = keep_prefix
+
+        zero_points_removed = n - int(keep.sum())
+        if zero_points_removed > 0:
+            logger.info("Filtered out %d startup/inactive data points", zero_points_removed)
+
+        filtered = {
+            name: row[keep] for name, row in zip(SimulationResults._fields[1:], arr)
+        }
+        return SimulationResults(time_vector=t[keep], **filtered)
+
+    @classmethod
+    def parse_matrix_results(cls, raw_matrix: Any) -> Optional[SimulationResults]:
+        """
+        Parses the N-by-9 matrix produced by sim_the_model with ReturnMatrix.
+
+        The columns are [Time, Batt, BattRecharge, EVRecharge, GridRequest,
+        Vehicle1..4BatteryLevel], so the whole result arrives from MATLAB
+        as one bulk transfer instead of nine struct conversions.
+
+        Args:
+            raw_matrix: The matlab.double matrix returned by the model
+
+        Returns:
+            SimulationResults object or None if parsing fails
+        """
+        if raw_matrix is None:
+            logger.error("Cannot parse empty results")
+            return None
+
+        try:
+            matrix = _matlab_to_ndarray(raw_matrix)
+            if matrix.ndim != 2 or matrix.shape[1] != 9:
+                logger.warning("Unexpected result matrix shape: %s", matrix.shape)
+                return None
+
+            columns = [np.ascontiguousarray(matrix[:, i]) for i in range(9)]
+            return cls._filter_zero_datapoints(*columns)
+
+        except Exception as e:
+            _handle_exception(e, "Error parsing matrix simulation results")
+            return None
+
     @classmethod
     def parse_simulation_results(
         cls, raw_results: Dict[str, Any]
@@ -352,49 +728,27 @@ class ResultsParser:
 
             time_len = len(time_vector)
 
-            # Extract all required data series
-            batt_values = cls.extract_data_from_result(
-                raw_results, "Batt", expected_length=time_len
-            ) or [float("nan")] * time_len
-            batt_recharge = cls.extract_data_from_result(
-                raw_results, "BattRecharge", expected_length=time_len
-            ) or [float("nan")] * time_len
-            ev_recharge = cls.extract_data_from_result(
-                raw_results, "EVRecharge", expected_length=time_len
-            ) or [float("nan")] * time_len
-            grid_request = cls.extract_data_from_result(
-                raw_results, "GridRequest", expected_length=time_len
-            ) or [float("nan")] * time_len
-            vehicle1_battery_level = cls.extract_data_from_result(
-                raw_results, "Vehicle1BatteryLevel", expected_length=time_len
-            ) or [float("nan")] * time_len
-            vehicle2_battery_level = cls.extract_data_from_result(
-                raw_results, "Vehicle2BatteryLevel", expected_length=time_len
-            ) or [float("nan")] * time_len
-            vehicle3_battery_level = cls.extract_data_from_result(
-                raw_results, "Vehicle3BatteryLevel", expected_length=time_len
-            ) or [float("nan")] * time_len
-            vehicle4_battery_level = cls.extract_data_from_result(
-                raw_results, "Vehicle4BatteryLevel", expected_length=time_len
-            ) or [float("nan")] * time_len
+            # Extract the eight data series concurrently; the bulk
+            # np.asarray conversion releases the GIL, so the per-key
+            # marshalling overlaps across threads
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = {
+                    key: executor.submit(
+                        cls.extract_data_from_result, raw_results, key, time_len
+                    )
+                    for key in cls._SERIES_KEYS
+                }
+                series = {}
+                for key, future in futures.items():
+                    data = future.result()
+                    # Fall back to NaNs on failed extraction
+                    series[key] = (
+                        data if data is not None else np.full(time_len, np.nan)
+                    )
 
             # Filter out data points where all data values are 0
-            filtered_results = cls._filter_zero_datapoints(
-                time_vector, batt_values, batt_recharge, ev_recharge, 
-                grid_request, vehicle1_battery_level, vehicle2_battery_level,
-                vehicle3_battery_level, vehicle4_battery_level
-            )
-
-            return SimulationResults(
-                time_vector=filtered_results[0],
-                batt_values=filtered_results[1],
-                batt_recharge=filtered_results[2],
-                ev_recharge=filtered_results[3],
-                grid_request=filtered_results[4],
-                vehicle1_battery_level=filtered_results[5],
-                vehicle2_battery_level=filtered_results[6],
-                vehicle3_battery_level=filtered_results[7],
-                vehicle4_battery_level=filtered_results[8],
+            return cls._filter_zero_datapoints(
+                time_vector, *(series[key] for key in cls._SERIES_KEYS)
             )
 
         except Exception as e:
@@ -402,29 +756,133 @@ class ResultsParser:
             return None
 
 
+class LazySimulationResults:
+    """
+    Deferred view over a raw result matrix.
+
+    Parsing and startup filtering only run on first field access, so
+    callers that merely check whether a run produced output (or hand the
+    results elsewhere) do not pay for the filter. The materialized
+    SimulationResults is memoized after the first access.
+    """
+
+    __slots__ = ("_raw_matrix", "_parsed")
+
+    def __init__(self, raw_matrix: Any):
+        self._raw_matrix = raw_matrix
+        self._parsed: Optional[SimulationResults] = None
+
+    def materialize(self) -> Optional[SimulationResults]:
+        """Parses and filters the raw matrix (memoized)."""
+        if self._parsed is None and self._raw_matrix is not None:
+            self._parsed = ResultsParser.parse_matrix_results(self._raw_matrix)
+            self._raw_matrix = None  # Free the MATLAB-side buffer
+        return self._parsed
+
+    def __getattr__(self, name: str) -> Any:
+        if name in SimulationResults._fields or name == "data_length":
+            parsed = self.materialize()
+            if parsed is None:
+                raise AttributeError(f"No parsed results available for '{name}'")
+            return getattr(parsed, name)
+        raise AttributeError(name)
+
+
 class SimulationManager:
     """Manages the MATLAB engine and simulation execution."""
 
     def __init__(self):
         """Initialize the simulation manager."""
         self.matlab_engine = None
+        # True when this manager booted the engine itself (as opposed to
+        # attaching to a shared session started elsewhere)
+        self._owns_engine = True
+        # Memoized parsed results keyed by frozen parameters; the model is
+        # deterministic for a given parameter set and stop time
+        self._results_cache: Dict[Tuple, SimulationResults] = {}
+
+    def clear_cache(self) -> None:
+        """Drops all memoized simulation results (in-memory only)."""
+        self._results_cache.clear()
+
+    @staticmethod
+    def _results_cache_path(cache_key: Tuple) -> str:
+        """Maps a cache key to its on-disk .npz path."""
+        digest = hashlib.blake2b(
+            repr(cache_key).encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return os.path.join(RESULTS_CACHE_DIR, f"{digest}.npz")
+
+    def _load_persisted_results(self, cache_key: Tuple) -> Optional[SimulationResults]:
+        """Loads memoized results persisted by an earlier process, if any."""
+        try:
+            with np.load(self._results_cache_path(cache_key)) as data:
+                return SimulationResults(
+                    **{name: data[name] for name in SimulationResults._fields}
+                )
+        except (OSError, KeyError, ValueError):
+            return None
 
-    def start_engine(self) -> bool:
+    def _persist_results(self, cache_key: Tuple, results: SimulationResults) -> None:
+        """Writes memoized results to disk so later processes can reuse them."""
+        try:
+            os.makedirs(RESULTS_CACHE_DIR, exist_ok=True)
+            cache_path = self._results_cache_path(cache_key)
+            tmp_path = cache_path + ".tmp"
+            # Write to a sidecar file and move it into place atomically
+            with open(tmp_path, "wb") as cache_file:
+                np.savez(cache_file, **results._asdict())
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning("Could not persist simulation results cache: %s", e)
+
+    def start_engine(self, prebuild_rapid_accelerator: bool = False) -> bool:
         """
         Starts the MATLAB engine and prepares it for simulation.
 
+        Args:
+            prebuild_rapid_accelerator: Build the model's rapid-accelerator
+                target once at startup so sweep runs skip recompilation
+
         Returns:
             True if engine was started successfully, False otherwise
         """
         try:
-            logger.info("Starting MATLAB engine...")
-            self.matlab_engine = matlab.engine.start_matlab()
-            logger.info("MATLAB engine started successfully")
+            # Attach to an already-running shared session if one exists;
+            # this skips the multi-second MATLAB boot on repeat runs
+            shared_sessions = matlab.engine.find_matlab()
+            if shared_sessions:
+                logger.info("Connecting to shared MATLAB session '%s'...", shared_sessions[0])
+                self.matlab_engine = matlab.engine.connect_matlab(shared_sessions[0])
+                self._owns_engine = False
+                logger.info("Connected to shared MATLAB session")
+            else:
+                logger.info("Starting MATLAB engine...")
+                self.matlab_engine = matlab.engine.start_matlab()
+                self._owns_engine = True
+                # Share the new session so future runs can attach to it
+                self.matlab_engine.eval("matlab.engine.shareEngine", nargout=0)
+                logger.info("MATLAB engine started successfully")
 
             # Change to the directory of this script
             script_dir = os.path.dirname(os.path.abspath(__file__))
             self.matlab_engine.cd(script_dir, nargout=0)
-            logger.info(f"Changed MATLAB working directory to: {script_dir}")
+            logger.info("Changed MATLAB working directory to: %s", script_dir)
+
+            if prebuild_rapid_accelerator:
+                # Pay the accelerator build once up front; subsequent runs
+                # can then use rapid-accelerator mode without recompiling
+                try:
+                    self.matlab_engine.eval(
+                        "Simulink.BlockDiagram.buildRapidAcceleratorTarget"
+                        f"('{SIMULATION_MODEL_NAME}');",
+                        nargout=0,
+                    )
+                    logger.info("Rapid-accelerator target built for %s", SIMULATION_MODEL_NAME)
+                except Exception as e:
+                    # Not fatal: normal-mode simulation still works
+                    _handle_exception(e, "Rapid-accelerator target build failed")
+
             return True
 
         except Exception as e:
@@ -433,12 +891,16 @@ class SimulationManager:
             return False
 
     def stop_engine(self) -> None:
-        """Safely stops the MATLAB engine."""
+        """Safely stops the MATLAB engine (or detaches from a shared one)."""
         if self.matlab_engine:
             try:
-                logger.info("Stopping MATLAB engine...")
-                self.matlab_engine.quit()
-                logger.info("MATLAB engine stopped")
+                if self._owns_engine:
+                    logger.info("Stopping MATLAB engine...")
+                    self.matlab_engine.quit()
+                    logger.info("MATLAB engine stopped")
+                else:
+                    # Leave the shared session running for other processes
+                    logger.info("Disconnecting from shared MATLAB session")
 
             except Exception as e:
                 _handle_exception(e, "Error stopping MATLAB engine")
@@ -451,7 +913,8 @@ class SimulationManager:
         configure_for_deployment: bool = False,
         stop_time: int = SIMULATION_STOP_TIME_S,
         simulation_speed: float = DEFAULT_SIMULATION_SPEED,
-    ) -> Optional[Dict[str, Any]]:
+        return_matrix: bool = False,
+    ) -> Optional[Any]:
         """
         Runs the Simulink model simulation using the provided parameters.
 
@@ -460,9 +923,12 @@ class SimulationManager:
             configure_for_deployment: Flag for configuring the model for deployment
             stop_time: Simulation time in seconds
             simulation_speed: Speed multiplier for the simulation
+            return_matrix: Request the packed N-by-9 result matrix instead
+                of the struct-of-timeseries dictionary
 
         Returns:
-            Raw simulation results dictionary or None if simulation fails
+            Raw simulation results (dict, or matrix when return_matrix is
+            set) or None if simulation fails
         """
         if self.matlab_engine is None:
             logger.error("MATLAB engine not available. Cannot run simulation.")
@@ -472,17 +938,19 @@ class SimulationManager:
         if isinstance(params, SimulationParameters):
             params = params.to_dict()
 
-        logger.info(f"Running simulation with speed factor: {simulation_speed}")
+        logger.info("Running simulation with speed factor: %s", simulation_speed)
 
         try:
-            # Use raw stop time directly without adjustment
+            # Quantized so repeat runs share one time grid and cache key
             results = self.matlab_engine.sim_the_model(
                 "TunableParameters",
-                params,
+                _pack_tunable_parameters(params),
                 "ConfigureForDeployment",
                 configure_for_deployment,
                 "StopTime",
-                stop_time,
+                _quantize_stop_time(stop_time),
+                "ReturnMatrix",
+                return_matrix,
             )
             return results
 
@@ -490,13 +958,96 @@ class SimulationManager:
             _handle_exception(e, "Error during simulation")
             return None
 
+    def run_simulation_async(
+        self,
+        params: Union[Dict[str, Any], SimulationParameters],
+        configure_for_deployment: bool = False,
+        stop_time: int = SIMULATION_STOP_TIME_S,
+        simulation_speed: float = DEFAULT_SIMULATION_SPEED,
+        return_matrix: bool = False,
+    ) -> Optional[Any]:
+        """
+        Starts a simulation in the background without blocking.
+
+        Args:
+            params: Simulation parameters as dict or SimulationParameters object
+            configure_for_deployment: Flag for configuring the model for deployment
+            stop_time: Simulation time in seconds
+            simulation_speed: Speed multiplier for the simulation
+            return_matrix: Request the packed N-by-9 result matrix instead
+                of the struct-of-timeseries dictionary
+
+        Returns:
+            matlab.engine FutureResult, or None if the call could not start
+        """
+        if self.matlab_engine is None:
+            logger.error("MATLAB engine not available. Cannot run simulation.")
+            return None
+
+        if isinstance(params, SimulationParameters):
+            params = params.to_dict()
+
+        logger.info("Starting background simulation with speed factor: %s", simulation_speed)
+
+        try:
+            return self.matlab_engine.sim_the_model(
+                "TunableParameters",
+                _pack_tunable_parameters(params),
+                "ConfigureForDeployment",
+                configure_for_deployment,
+                "StopTime",
+                _quantize_stop_time(stop_time),
+                "ReturnMatrix",
+                return_matrix,
+                background=True,
+            )
+        except Exception as e:
+            _handle_exception(e, "Error starting background simulation")
+            return None
+
+    def run_simulation_batch(
+        self,
+        params_list: List[Union[Dict[str, Any], SimulationParameters]],
+        configure_for_deployment: bool = False,
+        stop_time: int = SIMULATION_STOP_TIME_S,
+        simulation_speed: float = DEFAULT_SIMULATION_SPEED,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Runs the model once per parameter set on a single engine session.
+
+        Amortizes the multi-second engine boot over a whole parameter
+        sweep instead of paying it per configuration.
+
+        Args:
+            params_list: One parameter dict or SimulationParameters per run
+            configure_for_deployment: Flag for configuring the model for deployment
+            stop_time: Simulation time in seconds
+            simulation_speed: Speed multiplier for the simulation
+
+        Returns:
+            Raw result dictionaries in input order (None for failed runs)
+        """
+        if self.matlab_engine is None:
+            logger.error("MATLAB engine not available. Cannot run simulation batch.")
+            return [None] * len(params_list)
+
+        logger.info("Running batch of %d simulations on one engine session", len(params_list))
+        return [
+            self.run_simulation(
+                params, configure_for_deployment, stop_time, simulation_speed
+            )
+            for params in params_list
+        ]
+
     def run_and_parse_simulation(
         self,
         params: Union[Dict[str, Any], SimulationParameters],
         configure_for_deployment: bool = False,
         stop_time: int = SIMULATION_STOP_TIME_S,
         simulation_speed: float = DEFAULT_SIMULATION_SPEED,
-    ) -> Optional[SimulationResults]:
+        lazy: bool = False,
+        compute_summary: bool = False,
+    ) -> Optional[Union[SimulationResults, LazySimulationResults, ResultsSummary]]:
         """
         Runs the simulation and returns parsed results.
 
@@ -505,17 +1056,277 @@ class SimulationManager:
             configure_for_deployment: Flag for configuring the model for deployment
             stop_time: Simulation time in seconds
             simulation_speed: Speed multiplier for the simulation
+            lazy: Defer parsing/filtering until a result field is accessed
+            compute_summary: Return a scalar ResultsSummary instead of the
+                full result arrays (takes precedence over lazy)
 
         Returns:
-            Parsed SimulationResults or None if simulation fails
+            Parsed SimulationResults (or a LazySimulationResults view when
+            lazy is set, or a ResultsSummary when compute_summary is set)
+            or None if simulation fails
         """
+        # Convert SimulationParameters to dict if needed
+        if isinstance(params, SimulationParameters):
+            params = params.to_dict()
+
+        # Round the parameter values so floating-point jitter between
+        # otherwise-identical configurations does not defeat the cache
+        cache_key = (
+            tuple(sorted((name, round(value, 3)) for name, value in params.items())),
+            configure_for_deployment,
+            _quantize_stop_time(stop_time),
+        )
+        cached_results = self._results_cache.get(cache_key)
+        if cached_results is not None:
+            logger.info("Reusing memoized results for identical parameter set")
+            return cached_results.summarize() if compute_summary else cached_results
+
+        persisted_results = self._load_persisted_results(cache_key)
+        if persisted_results is not None:
+            logger.info("Reusing persisted results for identical parameter set")
+            self._results_cache[cache_key] = persisted_results
+            return persisted_results.summarize() if compute_summary else persisted_results
+
         raw_results = self.run_simulation(
-            params, configure_for_deployment, stop_time, simulation_speed
+            params, configure_for_deployment, stop_time, simulation_speed,
+            return_matrix=True,
+        )
+
+        if lazy and not compute_summary:
+            # Hand back a deferred view; parse cost is only paid (and the
+            # result only cached by the wrapper) if a field is touched
+            return LazySimulationResults(raw_results) if raw_results is not None else None
+
+        if raw_results is not None:
+            parsed_results = ResultsParser.parse_matrix_results(raw_results)
+            if parsed_results is not None:
+                if len(self._results_cache) >= RESULTS_CACHE_MAX_ENTRIES:
+                    # Evict the oldest entry (dicts preserve insertion order)
+                    self._results_cache.pop(next(iter(self._results_cache)))
+                self._results_cache[cache_key] = parsed_results
+                self._persist_results(cache_key, parsed_results)
+                if compute_summary:
+                    # The caller only wants the reductions; the full
+                    # arrays stay behind in the caches for later reuse
+                    return parsed_results.summarize()
+            return parsed_results
+        return None
+
+    def run_and_parse_simulation_batch(
+        self,
+        params_list: List[Union[Dict[str, Any], SimulationParameters]],
+        configure_for_deployment: bool = False,
+        stop_time: int = SIMULATION_STOP_TIME_S,
+        simulation_speed: float = DEFAULT_SIMULATION_SPEED,
+    ) -> List[Optional[SimulationResults]]:
+        """
+        Runs a sweep with background futures, overlapping parse with execution.
+
+        The next simulation is submitted before the previous result is
+        collected, so Python-side parsing of run k happens while MATLAB
+        executes run k+1.
+
+        Args:
+            params_list: One parameter dict or SimulationParameters per run
+            configure_for_deployment: Flag for configuring the model for deployment
+            stop_time: Simulation time in seconds
+            simulation_speed: Speed multiplier for the simulation
+
+        Returns:
+            Parsed SimulationResults in input order (None for failed runs)
+        """
+        if self.matlab_engine is None or not params_list:
+            if self.matlab_engine is None:
+                logger.error("MATLAB engine not available. Cannot run simulation batch.")
+            return [None] * len(params_list)
+
+        parsed_results: List[Optional[SimulationResults]] = []
+        future = self.run_simulation_async(
+            params_list[0], configure_for_deployment, stop_time, simulation_speed,
+            return_matrix=True,
+        )
+
+        for index in range(len(params_list)):
+            # Queue the next run before blocking on the current one
+            next_future = None
+            if index + 1 < len(params_list):
+                next_future = self.run_simulation_async(
+                    params_list[index + 1],
+                    configure_for_deployment,
+                    stop_time,
+                    simulation_speed,
+                    return_matrix=True,
+                )
+
+            raw_results = None
+            if future is not None:
+                try:
+                    raw_results = future.result()
+                except Exception as e:
+                    _handle_exception(e, f"Error during batch simulation {index}")
+
+            parsed_results.append(
+                ResultsParser.parse_matrix_results(raw_results)
+                if raw_results is not None
+                else None
+            )
+            future = next_future
+
+        return parsed_results
+
+    def precompute_variants(
+        self,
+        params_list: List[Union[Dict[str, Any], SimulationParameters]],
+        configure_for_deployment: bool = False,
+        stop_time: int = SIMULATION_STOP_TIME_S,
+        simulation_speed: float = DEFAULT_SIMULATION_SPEED,
+    ) -> threading.Thread:
+        """
+        Speculatively simulates plausible next parameter sets in the background.
+
+        Each variant goes through run_and_parse_simulation on a daemon
+        thread, so its results land in the memory and disk caches. When
+        the dashboard's real parameters later match a precomputed
+        variant (the cache key rounds values to 3 decimals), the next
+        batch is served from cache instead of re-simulating.
+
+        Args:
+            params_list: Candidate next-state parameter sets, e.g. bay
+                occupancy toggles or discretized SOC steps
+            configure_for_deployment: Flag for configuring the model for deployment
+            stop_time: Simulation time in seconds
+            simulation_speed: Speed multiplier for the simulation
+
+        Returns:
+            The started worker thread (join it to wait for the sweep)
+        """
+
+        def _worker() -> None:
+            for index, params in enumerate(params_list):
+                try:
+                    self.run_and_parse_simulation(
+                        params, configure_for_deployment, stop_time, simulation_speed
+                    )
+                except Exception as e:
+                    _handle_exception(e, f"Speculative simulation {index} failed")
+
+        thread = threading.Thread(
+            target=_worker, name="sim-precompute", daemon=True
         )
+        thread.start()
+        return thread
+
+
+class SimulationRing:
+    """
+    Submission/completion ring decoupling parameter updates from MATLAB.
+
+    Callers enqueue parameter sets without blocking; a dedicated worker
+    thread feeds them to the engine one at a time and publishes
+    (submission_id, results) pairs on the completion side. The thread
+    mutating parameters therefore never waits on a running simulation.
+    """
+
+    def __init__(
+        self,
+        manager: "SimulationManager",
+        configure_for_deployment: bool = False,
+        stop_time: int = SIMULATION_STOP_TIME_S,
+    ):
+        self._manager = manager
+        self._configure_for_deployment = configure_for_deployment
+        self._stop_time = stop_time
+        self._submissions: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._completions: List[Tuple[Any, Optional[SimulationResults]]] = []
+        self._completion_available = threading.Condition()
+        self._worker = threading.Thread(target=self._run_worker, daemon=True)
+        self._worker.start()
+
+    def submit(
+        self, submission_id: Any, params: Union[Dict[str, Any], SimulationParameters]
+    ) -> None:
+        """Enqueues one parameter set without blocking."""
+        if isinstance(params, SimulationParameters):
+            params = params.to_dict()
+        self._submissions.put((submission_id, dict(params)))
+
+    def poll_completions(self) -> List[Tuple[Any, Optional[SimulationResults]]]:
+        """Drains and returns all finished (submission_id, results) pairs."""
+        with self._completion_available:
+            completed = self._completions
+            self._completions = []
+        return completed
+
+    def wait_for_completion(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until at least one completion is available (or timeout)."""
+        with self._completion_available:
+            return self._completion_available.wait_for(
+                lambda: bool(self._completions), timeout=timeout
+            )
 
-        if raw_results:
-            return ResultsParser.parse_simulation_results(raw_results)
+    def close(self) -> None:
+        """Stops the worker after the queued submissions drain."""
+        self._submissions.put(None)
+        self._worker.join()
+
+    def _run_worker(self) -> None:
+        """Worker loop: pull submissions, run the model, publish results."""
+        while True:
+            submission = self._submissions.get()
+            if submission is None:
+                break
+            submission_id, params = submission
+            results = self._manager.run_and_parse_simulation(
+                params,
+                configure_for_deployment=self._configure_for_deployment,
+                stop_time=self._stop_time,
+            )
+            with self._completion_available:
+                self._completions.append((submission_id, results))
+                self._completion_available.notify_all()
+
+
+# Process-wide shared manager so tests and scripts in the same process
+# reuse one engine instead of paying the boot cost per module
+_shared_manager: Optional[SimulationManager] = None
+
+
+def get_shared_manager() -> Optional[SimulationManager]:
+    """
+    Returns a process-wide SimulationManager, starting its engine on demand.
+
+    The engine is probed with a trivial eval before reuse; a dead engine
+    is replaced transparently. The shared engine is stopped at process
+    exit via atexit.
+
+    Returns:
+        The shared SimulationManager, or None if the engine cannot start
+    """
+    global _shared_manager
+
+    if _shared_manager is not None and _shared_manager.matlab_engine is not None:
+        try:
+            # Cheap liveness probe; a crashed engine raises here
+            _shared_manager.matlab_engine.eval("1;", nargout=0)
+            return _shared_manager
+        except Exception as e:
+            _handle_exception(e, "Shared MATLAB engine unresponsive, restarting")
+            _shared_manager.matlab_engine = None
+
+    manager = SimulationManager()
+    if not manager.start_engine():
         return None
+    _shared_manager = manager
+    return _shared_manager
+
+
+def _stop_shared_manager() -> None:
+    """atexit hook: stop the shared engine if one was started."""
+    if _shared_manager is not None:
+        _shared_manager.stop_engine()
+
+
+atexit.register(_stop_shared_manager)
 
 
 @contextmanager
@@ -535,6 +1346,35 @@ def simulation_session() -> Iterator[Optional[SimulationManager]]:
         manager.stop_engine()
 
 
+def save_batch_results_feather(
+    results_list: List[Optional[SimulationResults]], path: str
+) -> None:
+    """
+    Concatenates a sweep's results into one Feather file.
+
+    Each run is tagged with a run_id column matching its index in the
+    batch; failed runs (None) are skipped.
+
+    Args:
+        results_list: Parsed results as returned by the batch runners
+        path: Destination Feather file
+    """
+    if not HAS_PANDAS:
+        raise RuntimeError("pandas with pyarrow is required for Feather export")
+
+    frames = []
+    for run_id, results in enumerate(results_list):
+        if results is None:
+            continue
+        frame = pd.DataFrame(results._asdict())
+        frame["run_id"] = run_id
+        frames.append(frame)
+
+    if not frames:
+        raise ValueError("No successful runs to serialize")
+    pd.concat(frames, ignore_index=True).to_feather(path)
+
+
 def print_simulation_results(results: SimulationResults) -> None:
     """
     Prints simulation results to console.
@@ -543,24 +1383,29 @@ def print_simulation_results(results: SimulationResults) -> None:
         results: Simulation results object to print
     """
     logger.info("Simulation results:")
-    print(f"Time Vector: {results.time_vector}")
-    print(f"Batt: {results.batt_values}")
-    print(f"BattRecharge: {results.batt_recharge}")
-    print(f"EVRecharge: {results.ev_recharge}")
-    print(f"GridRequest: {results.grid_request}")
-    print(f"Vehicle1BatteryLevel: {results.vehicle1_battery_level}")
-    print(f"Vehicle2BatteryLevel: {results.vehicle2_battery_level}")
-    print(f"Vehicle3BatteryLevel: {results.vehicle3_battery_level}")
-    print(f"Vehicle4BatteryLevel: {results.vehicle4_battery_level}")
+    print(f"Time Vector: {np.array2string(results.time_vector)}")
+    print(f"Batt: {np.array2string(results.batt_values)}")
+    print(f"BattRecharge: {np.array2string(results.batt_recharge)}")
+    print(f"EVRecharge: {np.array2string(results.ev_recharge)}")
+    print(f"GridRequest: {np.array2string(results.grid_request)}")
+    print(f"Vehicle1BatteryLevel: {np.array2string(results.vehicle1_battery_level)}")
+    print(f"Vehicle2BatteryLevel: {np.array2string(results.vehicle2_battery_level)}")
+    print(f"Vehicle3BatteryLevel: {np.array2string(results.vehicle3_battery_level)}")
+    print(f"Vehicle4BatteryLevel: {np.array2string(results.vehicle4_battery_level)}")
 
 
 def get_user_simulation_speed() -> float:
     """
     Gets simulation speed from user input.
 
+    Non-interactive runs (piped stdin, CI) skip the prompt and use the
+    default so the process never blocks on a keyboard read.
+
     Returns:
         Simulation speed factor
     """
+    if not sys.stdin.isatty():
+        return DEFAULT_SIMULATION_SPEED
     try:
         return float(
             input(
@@ -569,7 +1414,7 @@ def get_user_simulation_speed() -> float:
             )
             or str(DEFAULT_SIMULATION_SPEED)
         )
-    except ValueError:
+    except (ValueError, EOFError):
         logger.warning("Invalid input. Using default simulation speed.")
         return DEFAULT_SIMULATION_SPEED
 
@@ -577,6 +1422,18 @@ def get_user_simulation_speed() -> float:
 # --- Main Execution ---
 if __name__ == "__main__":
     try:
+        # Warm the MATLAB engine in the background while the user types;
+        # the multi-second cold start overlaps the prompt instead of
+        # waiting behind it
+        manager = SimulationManager()
+        engine_started: List[bool] = []
+        engine_thread = threading.Thread(
+            target=lambda: engine_started.append(manager.start_engine()),
+            name="engine-warmup",
+            daemon=True,
+        )
+        engine_thread.start()
+
         # Get simulation speed from user
         simulation_speed = get_user_simulation_speed()
 
@@ -586,14 +1443,14 @@ if __name__ == "__main__":
             BatteryOutput=30.0,  # kW
         )
 
-        # Run simulation with context manager
-        with simulation_session() as sim_manager:
-            if sim_manager is None:
+        engine_thread.join()
+        try:
+            if not (engine_started and engine_started[0]):
                 logger.error("Failed to start simulation session")
                 sys.exit(1)
 
             # Run simulation and get parsed results
-            results = sim_manager.run_and_parse_simulation(
+            results = manager.run_and_parse_simulation(
                 params=params,
                 configure_for_deployment=True,
                 simulation_speed=simulation_speed,
@@ -604,6 +1461,8 @@ if __name__ == "__main__":
                 print_simulation_results(results)
             else:
                 logger.error("Simulation failed to produce results")
+        finally:
+            manager.stop_engine()
 
     except KeyboardInterrupt:
         logger.info("Simulation interrupted by user")
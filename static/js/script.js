@@ -146,6 +146,26 @@ socket.on('simulation_data', (data) => {
     processSimulationData(data);
 });
 
+socket.on('batch', (items) => {
+    // Server coalesces several events into one frame; dispatch each to its
+    // registered handlers by the embedded event name.
+    for (const item of items) {
+        for (const handler of socket.listeners(item.event)) {
+            handler(item.data);
+        }
+    }
+});
+
+socket.on('data_chunk', (chunk) => {
+    // Batched series arrive as binary float32 buffers; decode each channel
+    // zero-copy into a Float32Array and reuse the batch processing path.
+    const data = {};
+    for (const [key, buffer] of Object.entries(chunk.channels)) {
+        data[key] = new Float32Array(buffer);
+    }
+    processSimulationData(data);
+});
+
 socket.on('simulation_time_update', (data) => {
     // Note: updateSimulationTime function was removed as part of history removal
     // This event handler can be removed if no longer needed
@@ -0,0 +1,21 @@
+"""Shared constants for the test scripts.
+
+Hoisted here so each test references one prebuilt tuple/frozenset
+instead of rebuilding the literals on every call.
+"""
+
+# Result keys carrying per-bay vehicle battery levels, in bay order
+VEHICLE_LEVEL_KEYS = (
+    "vehicle1_battery_level",
+    "vehicle2_battery_level",
+    "vehicle3_battery_level",
+    "vehicle4_battery_level",
+)
+
+# SimulationParameters attribute names for the bay charge percentages
+BAY_PERCENT_ATTRS = (
+    "bay1_percentage",
+    "bay2_percentage",
+    "bay3_percentage",
+    "bay4_percentage",
+)
@@ -7,13 +7,13 @@ following the same pattern as battery SOC persistence.
 """
 
 import sys
-import time
 import logging
 from app import (
-    current_simulation_params, 
+    current_simulation_params,
     simulation_lock,
     logger
 )
+from _constants import VEHICLE_LEVEL_KEYS
 
 # Set up logging for this test
 test_logger = logging.getLogger("bay_battery_test")
@@ -26,38 +26,26 @@ test_logger.addHandler(handler)
 def test_user_set_flags():
     """Test that user-set flags are properly set when parameters are updated manually."""
     test_logger.info("=== Testing User-Set Flag Setting ===")
-    
+
+    user_set_percentages = {1: 75.0, 2: 50.0, 3: 25.0, 4: 90.0}
+
     with simulation_lock:
-        # Clear any existing user-set flags
-        for attr in ['_user_set_bay1_percentage', '_user_set_bay2_percentage', 
-                     '_user_set_bay3_percentage', '_user_set_bay4_percentage']:
-            if hasattr(current_simulation_params, attr):
-                delattr(current_simulation_params, attr)
-        
-        # Set bay percentages manually (simulating user input)
-        current_simulation_params.bay1_percentage = 75.0
-        current_simulation_params._user_set_bay1_percentage = True
-        
-        current_simulation_params.bay2_percentage = 50.0
-        current_simulation_params._user_set_bay2_percentage = True
-        
-        current_simulation_params.bay3_percentage = 25.0
-        current_simulation_params._user_set_bay3_percentage = True
-        
-        current_simulation_params.bay4_percentage = 90.0
-        current_simulation_params._user_set_bay4_percentage = True
-        
-        test_logger.info(f"Set bay1_percentage to {current_simulation_params.bay1_percentage}% (user-set: {getattr(current_simulation_params, '_user_set_bay1_percentage', False)})")
-        test_logger.info(f"Set bay2_percentage to {current_simulation_params.bay2_percentage}% (user-set: {getattr(current_simulation_params, '_user_set_bay2_percentage', False)})")
-        test_logger.info(f"Set bay3_percentage to {current_simulation_params.bay3_percentage}% (user-set: {getattr(current_simulation_params, '_user_set_bay3_percentage', False)})")
-        test_logger.info(f"Set bay4_percentage to {current_simulation_params.bay4_percentage}% (user-set: {getattr(current_simulation_params, '_user_set_bay4_percentage', False)})")
-    
+        # Clear any existing user-set flags, then set bay percentages
+        # manually (simulating user input) in one pass per bay
+        for bay, percentage in user_set_percentages.items():
+            flag_attr = f"_user_set_bay{bay}_percentage"
+            if hasattr(current_simulation_params, flag_attr):
+                delattr(current_simulation_params, flag_attr)
+
+            setattr(current_simulation_params, f"bay{bay}_percentage", percentage)
+            setattr(current_simulation_params, flag_attr, True)
+
+            test_logger.info(f"Set bay{bay}_percentage to {getattr(current_simulation_params, f'bay{bay}_percentage')}% (user-set: {getattr(current_simulation_params, flag_attr, False)})")
+
     # Verify all flags are set
-    assert getattr(current_simulation_params, '_user_set_bay1_percentage', False), "Bay 1 user-set flag not set"
-    assert getattr(current_simulation_params, '_user_set_bay2_percentage', False), "Bay 2 user-set flag not set"
-    assert getattr(current_simulation_params, '_user_set_bay3_percentage', False), "Bay 3 user-set flag not set"
-    assert getattr(current_simulation_params, '_user_set_bay4_percentage', False), "Bay 4 user-set flag not set"
-    
+    for bay in user_set_percentages:
+        assert getattr(current_simulation_params, f'_user_set_bay{bay}_percentage', False), f"Bay {bay} user-set flag not set"
+
     test_logger.info("✓ All user-set flags are correctly set")
     return True
 
@@ -66,13 +54,13 @@ def test_persistence_logic():
     test_logger.info("=== Testing Persistence Logic ===")
     
     # Store original values
-    original_bay1 = current_simulation_params.bay1_percentage
-    original_bay2 = current_simulation_params.bay2_percentage
-    original_bay3 = current_simulation_params.bay3_percentage
-    original_bay4 = current_simulation_params.bay4_percentage
-    
-    test_logger.info(f"Original values - Bay1: {original_bay1}%, Bay2: {original_bay2}%, Bay3: {original_bay3}%, Bay4: {original_bay4}%")
-    
+    original_percentages = {
+        bay: getattr(current_simulation_params, f"bay{bay}_percentage")
+        for bay in range(1, 5)
+    }
+
+    test_logger.info(f"Original values - " + ", ".join(f"Bay{bay}: {value}%" for bay, value in original_percentages.items()))
+
     # Simulate simulation results with different values
     mock_simulation_results = {
         'vehicle1_battery_level': [60.0],  # Different from user-set 75%
@@ -80,53 +68,26 @@ def test_persistence_logic():
         'vehicle3_battery_level': [95.0],  # Different from user-set 25%
         'vehicle4_battery_level': [30.0]   # Different from user-set 90%
     }
-    
-    test_logger.info(f"Mock simulation results - Bay1: {mock_simulation_results['vehicle1_battery_level'][0]}%, "
-                    f"Bay2: {mock_simulation_results['vehicle2_battery_level'][0]}%, "
-                    f"Bay3: {mock_simulation_results['vehicle3_battery_level'][0]}%, "
-                    f"Bay4: {mock_simulation_results['vehicle4_battery_level'][0]}%")
-    
+
+    test_logger.info(f"Mock simulation results - " + ", ".join(f"Bay{bay}: {mock_simulation_results[f'vehicle{bay}_battery_level'][0]}%" for bay in range(1, 5)))
+
     with simulation_lock:
-        # Simulate the persistence logic from run_continuous_simulation
-        
-        # Bay 1 - Should NOT be updated (user-set flag is True)
-        if (not hasattr(current_simulation_params, "_user_set_bay1_percentage") 
-            or not current_simulation_params._user_set_bay1_percentage):
-            current_simulation_params.bay1_percentage = mock_simulation_results['vehicle1_battery_level'][0]
-            test_logger.info("Bay 1 would be updated (but it shouldn't in this test)")
-        else:
-            test_logger.info("Bay 1 preserved - user-set flag prevented update")
-        
-        # Bay 2 - Should NOT be updated (user-set flag is True)
-        if (not hasattr(current_simulation_params, "_user_set_bay2_percentage") 
-            or not current_simulation_params._user_set_bay2_percentage):
-            current_simulation_params.bay2_percentage = mock_simulation_results['vehicle2_battery_level'][0]
-            test_logger.info("Bay 2 would be updated (but it shouldn't in this test)")
-        else:
-            test_logger.info("Bay 2 preserved - user-set flag prevented update")
-        
-        # Bay 3 - Should NOT be updated (user-set flag is True)
-        if (not hasattr(current_simulation_params, "_user_set_bay3_percentage") 
-            or not current_simulation_params._user_set_bay3_percentage):
-            current_simulation_params.bay3_percentage = mock_simulation_results['vehicle3_battery_level'][0]
-            test_logger.info("Bay 3 would be updated (but it shouldn't in this test)")
-        else:
-            test_logger.info("Bay 3 preserved - user-set flag prevented update")
-        
-        # Bay 4 - Should NOT be updated (user-set flag is True)
-        if (not hasattr(current_simulation_params, "_user_set_bay4_percentage") 
-            or not current_simulation_params._user_set_bay4_percentage):
-            current_simulation_params.bay4_percentage = mock_simulation_results['vehicle4_battery_level'][0]
-            test_logger.info("Bay 4 would be updated (but it shouldn't in this test)")
-        else:
-            test_logger.info("Bay 4 preserved - user-set flag prevented update")
-    
+        # Simulate the persistence logic from run_continuous_simulation;
+        # one pass over all four bays under a single lock acquisition.
+        # No bay should be updated here - all user-set flags are True.
+        for bay, key in enumerate(VEHICLE_LEVEL_KEYS, start=1):
+            if (not hasattr(current_simulation_params, f"_user_set_bay{bay}_percentage")
+                or not getattr(current_simulation_params, f"_user_set_bay{bay}_percentage")):
+                setattr(current_simulation_params, f"bay{bay}_percentage", mock_simulation_results[key][0])
+                test_logger.info(f"Bay {bay} would be updated (but it shouldn't in this test)")
+            else:
+                test_logger.info(f"Bay {bay} preserved - user-set flag prevented update")
+
     # Verify values are unchanged
-    assert current_simulation_params.bay1_percentage == original_bay1, f"Bay 1 value changed! Expected {original_bay1}, got {current_simulation_params.bay1_percentage}"
-    assert current_simulation_params.bay2_percentage == original_bay2, f"Bay 2 value changed! Expected {original_bay2}, got {current_simulation_params.bay2_percentage}"
-    assert current_simulation_params.bay3_percentage == original_bay3, f"Bay 3 value changed! Expected {original_bay3}, got {current_simulation_params.bay3_percentage}"
-    assert current_simulation_params.bay4_percentage == original_bay4, f"Bay 4 value changed! Expected {original_bay4}, got {current_simulation_params.bay4_percentage}"
-    
+    for bay, original in original_percentages.items():
+        current = getattr(current_simulation_params, f"bay{bay}_percentage")
+        assert current == original, f"Bay {bay} value changed! Expected {original}, got {current}"
+
     test_logger.info("✓ All user-set values were correctly preserved")
     return True
 
@@ -136,22 +97,19 @@ def test_automatic_updates():
     
     with simulation_lock:
         # Clear user-set flags to simulate automatic mode
-        current_simulation_params._user_set_bay1_percentage = False
-        current_simulation_params._user_set_bay2_percentage = False
-        current_simulation_params._user_set_bay3_percentage = False
-        current_simulation_params._user_set_bay4_percentage = False
-        
+        for bay in range(1, 5):
+            setattr(current_simulation_params, f"_user_set_bay{bay}_percentage", False)
+
         test_logger.info("Cleared all user-set flags")
-    
+
     # Set some initial values
+    initial_percentages = {1: 10.0, 2: 20.0, 3: 30.0, 4: 40.0}
     with simulation_lock:
-        current_simulation_params.bay1_percentage = 10.0
-        current_simulation_params.bay2_percentage = 20.0
-        current_simulation_params.bay3_percentage = 30.0
-        current_simulation_params.bay4_percentage = 40.0
-    
-    test_logger.info(f"Set initial values - Bay1: {current_simulation_params.bay1_percentage}%, Bay2: {current_simulation_params.bay2_percentage}%, Bay3: {current_simulation_params.bay3_percentage}%, Bay4: {current_simulation_params.bay4_percentage}%")
-    
+        for bay, percentage in initial_percentages.items():
+            setattr(current_simulation_params, f"bay{bay}_percentage", percentage)
+
+    test_logger.info(f"Set initial values - " + ", ".join(f"Bay{bay}: {getattr(current_simulation_params, f'bay{bay}_percentage')}%" for bay in range(1, 5)))
+
     # Simulate simulation results
     mock_simulation_results = {
         'vehicle1_battery_level': [85.0],
@@ -159,42 +117,24 @@ def test_automatic_updates():
         'vehicle3_battery_level': [45.0],
         'vehicle4_battery_level': [25.0]
     }
-    
-    test_logger.info(f"Mock simulation results - Bay1: {mock_simulation_results['vehicle1_battery_level'][0]}%, Bay2: {mock_simulation_results['vehicle2_battery_level'][0]}%, Bay3: {mock_simulation_results['vehicle3_battery_level'][0]}%, Bay4: {mock_simulation_results['vehicle4_battery_level'][0]}%")
-    
+
+    test_logger.info(f"Mock simulation results - " + ", ".join(f"Bay{bay}: {mock_simulation_results[f'vehicle{bay}_battery_level'][0]}%" for bay in range(1, 5)))
+
     with simulation_lock:
-        # Simulate the persistence logic - should update because flags are False
-        
-        # Bay 1 - Should be updated
-        if (not hasattr(current_simulation_params, "_user_set_bay1_percentage") 
-            or not current_simulation_params._user_set_bay1_percentage):
-            current_simulation_params.bay1_percentage = mock_simulation_results['vehicle1_battery_level'][0]
-            test_logger.info("Bay 1 updated automatically")
-        
-        # Bay 2 - Should be updated
-        if (not hasattr(current_simulation_params, "_user_set_bay2_percentage") 
-            or not current_simulation_params._user_set_bay2_percentage):
-            current_simulation_params.bay2_percentage = mock_simulation_results['vehicle2_battery_level'][0]
-            test_logger.info("Bay 2 updated automatically")
-        
-        # Bay 3 - Should be updated
-        if (not hasattr(current_simulation_params, "_user_set_bay3_percentage") 
-            or not current_simulation_params._user_set_bay3_percentage):
-            current_simulation_params.bay3_percentage = mock_simulation_results['vehicle3_battery_level'][0]
-            test_logger.info("Bay 3 updated automatically")
-        
-        # Bay 4 - Should be updated
-        if (not hasattr(current_simulation_params, "_user_set_bay4_percentage") 
-            or not current_simulation_params._user_set_bay4_percentage):
-            current_simulation_params.bay4_percentage = mock_simulation_results['vehicle4_battery_level'][0]
-            test_logger.info("Bay 4 updated automatically")
-    
+        # Simulate the persistence logic - every bay should be updated
+        # because the flags are False; one pass under a single lock hold
+        for bay, key in enumerate(VEHICLE_LEVEL_KEYS, start=1):
+            if (not hasattr(current_simulation_params, f"_user_set_bay{bay}_percentage")
+                or not getattr(current_simulation_params, f"_user_set_bay{bay}_percentage")):
+                setattr(current_simulation_params, f"bay{bay}_percentage", mock_simulation_results[key][0])
+                test_logger.info(f"Bay {bay} updated automatically")
+
     # Verify values were updated
-    assert current_simulation_params.bay1_percentage == 85.0, f"Bay 1 not updated! Expected 85.0, got {current_simulation_params.bay1_percentage}"
-    assert current_simulation_params.bay2_percentage == 65.0, f"Bay 2 not updated! Expected 65.0, got {current_simulation_params.bay2_percentage}"
-    assert current_simulation_params.bay3_percentage == 45.0, f"Bay 3 not updated! Expected 45.0, got {current_simulation_params.bay3_percentage}"
-    assert current_simulation_params.bay4_percentage == 25.0, f"Bay 4 not updated! Expected 25.0, got {current_simulation_params.bay4_percentage}"
-    
+    for bay in range(1, 5):
+        expected = mock_simulation_results[f'vehicle{bay}_battery_level'][0]
+        current = getattr(current_simulation_params, f"bay{bay}_percentage")
+        assert current == expected, f"Bay {bay} not updated! Expected {expected}, got {current}"
+
     test_logger.info("✓ All values were correctly updated when user-set flags were False")
     return True
 
@@ -218,16 +158,14 @@ def run_all_tests():
         
         return True
         
-    except Exception as e:
-        test_logger.error(f"❌ TEST FAILED: {str(e)}")
-        import traceback
-        test_logger.error(traceback.format_exc())
+    except Exception:
+        # logger.exception pulls the traceback from sys.exc_info() itself
+        test_logger.exception("❌ TEST FAILED")
         return False
 
 if __name__ == "__main__":
-    # Wait a moment to ensure the application is fully started
-    time.sleep(2)
-    
+    # Importing app initializes everything synchronously; a running batch
+    # can be awaited with app.batch_complete_event instead of sleeping
     try:
         success = run_all_tests()
         if success:
@@ -7,13 +7,13 @@ when user-set flags are False (automatic mode).
 """
 
 import sys
-import time
 import logging
 from app import (
-    current_simulation_params, 
+    current_simulation_params,
     simulation_lock,
     logger
 )
+from _constants import VEHICLE_LEVEL_KEYS
 
 # Set up logging for this test
 test_logger = logging.getLogger("bay_battery_update_test")
@@ -27,24 +27,17 @@ def test_bay_percentage_updating():
     """Test that bay percentages are updated when user-set flags are False."""
     test_logger.info("=== Testing Bay Percentage Automatic Updates ===")
     
+    # Build the initial state outside the lock, then commit both vectors
+    # and snapshot them in one short lock hold
+    initial_values = (25.0, 30.0, 35.0, 40.0)
     with simulation_lock:
-        # Set initial values
-        current_simulation_params.bay1_percentage = 25.0
-        current_simulation_params.bay2_percentage = 30.0
-        current_simulation_params.bay3_percentage = 35.0
-        current_simulation_params.bay4_percentage = 40.0
-        
+        current_simulation_params.bay_percentages[:] = initial_values
         # Ensure user-set flags are False (automatic mode)
-        current_simulation_params._user_set_bay1_percentage = False
-        current_simulation_params._user_set_bay2_percentage = False
-        current_simulation_params._user_set_bay3_percentage = False
-        current_simulation_params._user_set_bay4_percentage = False
-        
-        test_logger.info(f"Initial values - Bay1: {current_simulation_params.bay1_percentage}%, "
-                        f"Bay2: {current_simulation_params.bay2_percentage}%, "
-                        f"Bay3: {current_simulation_params.bay3_percentage}%, "
-                        f"Bay4: {current_simulation_params.bay4_percentage}%")
-    
+        current_simulation_params.user_set[:] = False
+        snapshot = tuple(current_simulation_params.bay_percentages)
+
+    test_logger.info("Initial values - " + ", ".join(f"Bay{bay}: {value}%" for bay, value in enumerate(snapshot, start=1)))
+
     # Simulate simulation results with new values
     mock_simulation_results = {
         'vehicle1_battery_level': [85.0],
@@ -52,58 +45,31 @@ def test_bay_percentage_updating():
         'vehicle3_battery_level': [70.0],
         'vehicle4_battery_level': [95.0]
     }
-    
-    test_logger.info(f"Mock simulation results - Bay1: {mock_simulation_results['vehicle1_battery_level'][0]}%, "
-                    f"Bay2: {mock_simulation_results['vehicle2_battery_level'][0]}%, "
-                    f"Bay3: {mock_simulation_results['vehicle3_battery_level'][0]}%, "
-                    f"Bay4: {mock_simulation_results['vehicle4_battery_level'][0]}%")
-    
+
+    new_levels = [mock_simulation_results[key][0] for key in VEHICLE_LEVEL_KEYS]
+    test_logger.info("Mock simulation results - " + ", ".join(f"Bay{bay}: {value}%" for bay, value in enumerate(new_levels, start=1)))
+
     with simulation_lock:
-        # Apply the update logic from run_continuous_simulation
-        
-        # Bay 1 - Should be updated (user-set flag is False)
-        if (not hasattr(current_simulation_params, "_user_set_bay1_percentage") 
-            or not current_simulation_params._user_set_bay1_percentage):
-            current_simulation_params.bay1_percentage = mock_simulation_results['vehicle1_battery_level'][0]
-            test_logger.info("Bay 1 updated from simulation results")
-        else:
-            test_logger.info("Bay 1 preserved (unexpected in this test)")
-        
-        # Bay 2 - Should be updated (user-set flag is False)
-        if (not hasattr(current_simulation_params, "_user_set_bay2_percentage") 
-            or not current_simulation_params._user_set_bay2_percentage):
-            current_simulation_params.bay2_percentage = mock_simulation_results['vehicle2_battery_level'][0]
-            test_logger.info("Bay 2 updated from simulation results")
-        else:
-            test_logger.info("Bay 2 preserved (unexpected in this test)")
-        
-        # Bay 3 - Should be updated (user-set flag is False)
-        if (not hasattr(current_simulation_params, "_user_set_bay3_percentage") 
-            or not current_simulation_params._user_set_bay3_percentage):
-            current_simulation_params.bay3_percentage = mock_simulation_results['vehicle3_battery_level'][0]
-            test_logger.info("Bay 3 updated from simulation results")
-        else:
-            test_logger.info("Bay 3 preserved (unexpected in this test)")
-        
-        # Bay 4 - Should be updated (user-set flag is False)
-        if (not hasattr(current_simulation_params, "_user_set_bay4_percentage") 
-            or not current_simulation_params._user_set_bay4_percentage):
-            current_simulation_params.bay4_percentage = mock_simulation_results['vehicle4_battery_level'][0]
-            test_logger.info("Bay 4 updated from simulation results")
-        else:
-            test_logger.info("Bay 4 preserved (unexpected in this test)")
-    
+        # Apply the update logic from run_continuous_simulation: one
+        # masked vector store under a single lock hold
+        user_set_mask = current_simulation_params.user_set_mask
+        current_simulation_params.apply_bay_levels(new_levels)
+        final_values = tuple(current_simulation_params.bay_percentages)
+
+    # One log call for all four decisions instead of one emit per bay
+    test_logger.info("; ".join(
+        f"Bay {bay} updated from simulation results"
+        if not (user_set_mask & (1 << (bay - 1)))
+        else f"Bay {bay} preserved (unexpected in this test)"
+        for bay in range(1, 5)
+    ))
+
     # Verify values were updated correctly
-    assert current_simulation_params.bay1_percentage == 85.0, f"Bay 1 not updated! Expected 85.0, got {current_simulation_params.bay1_percentage}"
-    assert current_simulation_params.bay2_percentage == 90.0, f"Bay 2 not updated! Expected 90.0, got {current_simulation_params.bay2_percentage}"
-    assert current_simulation_params.bay3_percentage == 70.0, f"Bay 3 not updated! Expected 70.0, got {current_simulation_params.bay3_percentage}"
-    assert current_simulation_params.bay4_percentage == 95.0, f"Bay 4 not updated! Expected 95.0, got {current_simulation_params.bay4_percentage}"
-    
+    for bay, (value, expected) in enumerate(zip(final_values, new_levels), start=1):
+        assert value == expected, f"Bay {bay} not updated! Expected {expected}, got {value}"
+
     test_logger.info("✓ All bay percentages were correctly updated from simulation results")
-    test_logger.info(f"Final values - Bay1: {current_simulation_params.bay1_percentage}%, "
-                    f"Bay2: {current_simulation_params.bay2_percentage}%, "
-                    f"Bay3: {current_simulation_params.bay3_percentage}%, "
-                    f"Bay4: {current_simulation_params.bay4_percentage}%")
+    test_logger.info("Final values - " + ", ".join(f"Bay{bay}: {value}%" for bay, value in enumerate(final_values, start=1)))
     return True
 
 def test_user_set_flag_behavior():
@@ -111,49 +77,47 @@ def test_user_set_flag_behavior():
     test_logger.info("=== Testing User-Set Flag Behavior ===")
     
     with simulation_lock:
-        # Clear any existing flags
-        for attr in ['_user_set_bay1_percentage', '_user_set_bay2_percentage', 
-                     '_user_set_bay3_percentage', '_user_set_bay4_percentage']:
-            if hasattr(current_simulation_params, attr):
-                delattr(current_simulation_params, attr)
-        
-        # Set some values and flags manually
+        # Clear any existing flags, then set some values and flags
+        # manually; one lock hold covers the whole setup
+        current_simulation_params.user_set[:] = False
+
         current_simulation_params.bay1_percentage = 55.0
         current_simulation_params._user_set_bay1_percentage = True
-        
+
         current_simulation_params.bay2_percentage = 60.0
         # Don't set bay2 flag - should default to False
-        
-        test_logger.info(f"Set bay1_percentage to {current_simulation_params.bay1_percentage}% with user-set flag True")
-        test_logger.info(f"Set bay2_percentage to {current_simulation_params.bay2_percentage}% with no user-set flag")
-    
-    # Simulate trying to update from simulation results
+
+    test_logger.info("Set bay1_percentage to 55.0% with user-set flag True; "
+                     "set bay2_percentage to 60.0% with no user-set flag")
+
+    # Simulate trying to update from simulation results; NaN entries
+    # leave bays 3 and 4 untouched, matching batches with no data
     mock_results = {
         'vehicle1_battery_level': [75.0],  # Different from user-set 55%
         'vehicle2_battery_level': [80.0],  # Different from 60%
     }
-    
+    new_levels = [
+        mock_results['vehicle1_battery_level'][0],
+        mock_results['vehicle2_battery_level'][0],
+        float('nan'),
+        float('nan'),
+    ]
+
     with simulation_lock:
-        # Bay 1 - Should NOT be updated (user-set flag is True)
-        if (not hasattr(current_simulation_params, "_user_set_bay1_percentage") 
-            or not current_simulation_params._user_set_bay1_percentage):
-            current_simulation_params.bay1_percentage = mock_results['vehicle1_battery_level'][0]
-            test_logger.info("Bay 1 updated (unexpected!)")
-        else:
-            test_logger.info("Bay 1 preserved due to user-set flag")
-        
-        # Bay 2 - Should be updated (no user-set flag or flag is False)
-        if (not hasattr(current_simulation_params, "_user_set_bay2_percentage") 
-            or not current_simulation_params._user_set_bay2_percentage):
-            current_simulation_params.bay2_percentage = mock_results['vehicle2_battery_level'][0]
-            test_logger.info("Bay 2 updated (expected)")
-        else:
-            test_logger.info("Bay 2 preserved (unexpected!)")
-    
+        user_set_mask = current_simulation_params.user_set_mask
+        current_simulation_params.apply_bay_levels(new_levels)
+        bay1_value = current_simulation_params.bay1_percentage
+        bay2_value = current_simulation_params.bay2_percentage
+
+    test_logger.info("; ".join((
+        "Bay 1 preserved due to user-set flag" if user_set_mask & 1 else "Bay 1 updated (unexpected!)",
+        "Bay 2 updated (expected)" if not (user_set_mask & 2) else "Bay 2 preserved (unexpected!)",
+    )))
+
     # Verify behavior
-    assert current_simulation_params.bay1_percentage == 55.0, f"Bay 1 should be preserved! Expected 55.0, got {current_simulation_params.bay1_percentage}"
-    assert current_simulation_params.bay2_percentage == 80.0, f"Bay 2 should be updated! Expected 80.0, got {current_simulation_params.bay2_percentage}"
-    
+    assert bay1_value == 55.0, f"Bay 1 should be preserved! Expected 55.0, got {bay1_value}"
+    assert bay2_value == 80.0, f"Bay 2 should be updated! Expected 80.0, got {bay2_value}"
+
     test_logger.info("✓ User-set flag behavior working correctly")
     return True
 
@@ -174,16 +138,14 @@ def run_all_tests():
         
         return True
         
-    except Exception as e:
-        test_logger.error(f"❌ TEST FAILED: {str(e)}")
-        import traceback
-        test_logger.error(traceback.format_exc())
+    except Exception:
+        # logger.exception pulls the traceback from sys.exc_info() itself
+        test_logger.exception("❌ TEST FAILED")
         return False
 
 if __name__ == "__main__":
-    # Wait a moment to ensure the application is fully started
-    time.sleep(2)
-    
+    # Importing app initializes everything synchronously; a running batch
+    # can be awaited with app.batch_complete_event instead of sleeping
     try:
         success = run_all_tests()
         if success:
@@ -4,35 +4,138 @@ Test script to verify that the data cycling fix works correctly when simulation
 This simulates the scenario where parameters are changed during simulation runtime.
 """
 
+import contextlib
+import functools
+import io
 import sys
 import os
 from datetime import datetime, timedelta
 import json
 
+import numpy as np
+
 # Add the current directory to the path to import modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Optional JIT for the cycling kernel, matching simulation.py
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+_DC_JSON = "pvwatts_response.json"
+_DC_NPY = "pvwatts_dc.npy"
+
+
+@functools.lru_cache()
+def _load_dc():
+    """Loads the hourly DC watts series as a float32 array.
+
+    Keeps a .npy sidecar next to the JSON response so reruns memory-map
+    the binary array instead of re-parsing ~8760 JSON floats; the
+    sidecar is rebuilt whenever the JSON is newer. Falls back to dummy
+    sequential data when neither file is available.
+    """
+    try:
+        json_mtime = os.path.getmtime(_DC_JSON)
+    except OSError:
+        print("Using dummy data for testing")
+        return np.arange(8760, dtype=np.float32)
+
+    try:
+        if os.path.getmtime(_DC_NPY) >= json_mtime:
+            return np.load(_DC_NPY, mmap_mode="r")
+    except OSError:
+        pass
+
+    with open(_DC_JSON, "r") as f:
+        dc = np.asarray(json.load(f)["outputs"]["dc"], dtype=np.float32)
+    try:
+        np.save(_DC_NPY, dc)
+    except OSError:
+        pass  # read-only checkout; the in-process cache still applies
+    return dc
+
+
+def _buffered_output(func):
+    """Collects the function's prints and emits them in one write.
+
+    Each print otherwise takes the stdout lock and flushes separately,
+    which dominates runtime when stdout is a pipe.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        buf = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buf):
+                return func(*args, **kwargs)
+        finally:
+            sys.stdout.write(buf.getvalue())
+            sys.stdout.flush()
+    return wrapper
+
+
+def _hour_index_lut(n_hours):
+    """Builds a (day_of_year-1)*24 + hour → cycled-index lookup table.
+
+    One vectorized modulo at build time replaces the per-call modulo in
+    the hour-index helpers; 366 days covers leap years.
+    """
+    return np.arange(366 * 24, dtype=np.int32) % n_hours
+
+
+def _cycle_indices_kernel(start_idx, start_sec_of_year, dt_sec, n_ticks, n_hours):
+    """Walks n_ticks of dt_sec and returns (old_method, new_method) indices.
+
+    The "new" index is derived from seconds-of-year by integer division
+    (86400/3600) instead of datetime.timetuple per tick; the "old" index
+    reproduces the buggy increment arithmetic the fix replaced. Kept as
+    a plain numeric loop so numba can compile it for long sweeps.
+    """
+    old_idx = np.empty(n_ticks, dtype=np.int32)
+    new_idx = np.empty(n_ticks, dtype=np.int32)
+    cur = start_idx
+    total = 0
+    for k in range(n_ticks):
+        total += dt_sec
+        increments = total // 3600 - cur
+        if increments > 0:
+            old_idx[k] = (cur + increments) % n_hours
+        else:
+            old_idx[k] = cur
+        sec = start_sec_of_year + (k + 1) * dt_sec
+        new_idx[k] = ((sec // 86400) * 24 + (sec % 86400) // 3600) % n_hours
+        cur = new_idx[k]
+    return old_idx, new_idx
+
+
+if HAS_NUMBA:
+    _cycle_indices_kernel = njit(cache=True)(_cycle_indices_kernel)
+
+
+def _sec_of_year(dt):
+    """Seconds elapsed since the start of dt's year."""
+    return ((dt.timetuple().tm_yday - 1) * 86400
+            + dt.hour * 3600 + dt.minute * 60 + dt.second)
+
+
+@_buffered_output
 def test_hour_index_calculation():
     """Test the hour index calculation logic that was fixed."""
     print("Testing hour index calculation logic...")
     
-    # Load sample hourly_dc_watts data (8760 hours)
-    try:
-        with open("pvwatts_response.json", "r") as f:
-            data = json.load(f)
-        hourly_dc_watts = data["outputs"]["dc"]
-        print(f"Loaded {len(hourly_dc_watts)} hourly DC watts values")
-    except:
-        # Create dummy data if file not found
-        hourly_dc_watts = list(range(8760))  # Simple sequential values for testing
-        print("Using dummy data for testing")
+    # Load sample hourly_dc_watts data (8760 hours), plus a precomputed
+    # day/hour → index table so no modulo runs per call
+    hourly_dc_watts = _load_dc()
+    print(f"Loaded {len(hourly_dc_watts)} hourly DC watts values")
+    lut = _hour_index_lut(len(hourly_dc_watts))
 
     def calculate_hour_index(simulation_datetime):
         """Calculate hour index based on datetime (the correct method)."""
         day_of_year = simulation_datetime.timetuple().tm_yday
         hour_of_day = simulation_datetime.hour
-        calculated_idx = (day_of_year - 1) * 24 + hour_of_day
-        return calculated_idx % len(hourly_dc_watts)
+        return int(lut[(day_of_year - 1) * 24 + hour_of_day])
 
     # Test scenarios
     test_scenarios = [
@@ -73,24 +176,19 @@ def test_hour_index_calculation():
         print(f"Expected: {expected}")
         print("-" * 60)
 
+@_buffered_output
 def test_parameter_change_simulation():
     """Simulate the parameter change scenario that was causing issues."""
     print("\n" + "=" * 80)
     print("SIMULATION: Parameter Change During Runtime")
     print("=" * 80)
     
-    # Load hourly data
-    try:
-        with open("pvwatts_response.json", "r") as f:
-            data = json.load(f)
-        hourly_dc_watts = data["outputs"]["dc"]
-    except:
-        hourly_dc_watts = list(range(8760))
-    
+    # Load hourly data (cached; parsed at most once per process)
+    hourly_dc_watts = _load_dc()
+    lut = _hour_index_lut(len(hourly_dc_watts))
+
     def get_hour_index_from_datetime(dt):
-        day_of_year = dt.timetuple().tm_yday
-        hour_of_day = dt.hour
-        return ((day_of_year - 1) * 24 + hour_of_day) % len(hourly_dc_watts)
+        return int(lut[(dt.timetuple().tm_yday - 1) * 24 + dt.hour])
     
     # Simulate the old problematic behavior vs new fixed behavior
     print("\nSimulating old vs new behavior:")
@@ -105,29 +203,24 @@ def test_parameter_change_simulation():
     print(f"  Hour Index: {current_dc_hour_index}")
     print(f"  DC Watts: {hourly_dc_watts[current_dc_hour_index]}")
     
-    # Simulate running for 2 hours (multiple iterations)
+    # Simulate running for 2 hours (4 iterations of 30 minutes): one
+    # kernel call produces the whole old-vs-new index trace, leaving the
+    # loop below as display only
     simulation_datetime = initial_datetime
-    for iteration in range(4):  # 4 iterations of 30 minutes each = 2 hours
+    old_indices, new_indices = _cycle_indices_kernel(
+        current_dc_hour_index, _sec_of_year(initial_datetime),
+        1800, 4, len(hourly_dc_watts),
+    )
+    for iteration, (old_index, new_index) in enumerate(zip(old_indices, new_indices)):
         simulation_datetime += timedelta(seconds=1800)  # 30 minutes
         total_simulation_seconds += 1800
-        
-        # OLD METHOD (problematic)
-        old_hour_increments = (total_simulation_seconds // 3600) - current_dc_hour_index
-        if old_hour_increments > 0:
-            old_index = (current_dc_hour_index + old_hour_increments) % len(hourly_dc_watts)
-        else:
-            old_index = current_dc_hour_index
-        
-        # NEW METHOD (fixed)
-        new_index = get_hour_index_from_datetime(simulation_datetime)
-        
+
         print(f"\nIteration {iteration + 1} - {simulation_datetime.strftime('%Y-%m-%d %H:%M:%S')}:")
         print(f"  Old Method Index: {old_index}")
         print(f"  New Method Index: {new_index}")
         print(f"  Match: {'✅' if old_index == new_index else '❌'}")
-        
-        # Update for next iteration
-        current_dc_hour_index = new_index
+
+    current_dc_hour_index = int(new_indices[-1])
     
     # Now simulate parameter change (restart simulation)
     print(f"\n🔄 PARAMETER CHANGE - Restarting simulation at new time:")
@@ -144,18 +237,20 @@ def test_parameter_change_simulation():
     simulation_datetime = new_start_datetime
     
     print(f"\nContinuing from new parameters:")
-    for iteration in range(2):  # 2 more iterations
+    # Both methods now work correctly; reuse the kernel's fixed-method trace
+    _, new_indices = _cycle_indices_kernel(
+        current_dc_hour_index, _sec_of_year(new_start_datetime),
+        1800, 2, len(hourly_dc_watts),
+    )
+    for iteration, new_index in enumerate(new_indices):
         simulation_datetime += timedelta(seconds=1800)  # 30 minutes
         total_simulation_seconds += 1800
-        
-        # Both methods should now work correctly
-        new_index = get_hour_index_from_datetime(simulation_datetime)
-        
+
         print(f"  Iteration {iteration + 1} - {simulation_datetime.strftime('%Y-%m-%d %H:%M:%S')}:")
         print(f"    Hour Index: {new_index}")
         print(f"    DC Watts: {hourly_dc_watts[new_index]}")
-        
-        current_dc_hour_index = new_index
+
+        current_dc_hour_index = int(new_index)
 
 if __name__ == "__main__":
     print("Data Cycling Fix Verification Test")
@@ -8,6 +8,8 @@ import unittest
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 
+import numpy as np
+
 # Add parent directory to path to import modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -68,9 +70,9 @@ class TestPeakStatusFunctionality(unittest.TestCase):
         
         cost_info = calculate_electricity_cost(grid_request, time_hours, test_datetime)
         
-        # Should use peak rate (0.229 RM/kWh)
-        expected_cost = 10.0 * 1.0 * 0.229  # 2.29 RM
-        self.assertAlmostEqual(cost_info['cost'], expected_cost, places=3)
+        # Should use peak rate (0.229 RM/kWh); compare in integer
+        # tenths of a cent instead of assertAlmostEqual's delta math
+        self.assertEqual(int(round(cost_info['cost'] * 1000)), 2290)  # 2.29 RM
         self.assertEqual(cost_info['rate_type'], 'Peak')
         self.assertEqual(cost_info['rate_used'], 0.229)
 
@@ -87,9 +89,9 @@ class TestPeakStatusFunctionality(unittest.TestCase):
         
         cost_info = calculate_electricity_cost(grid_request, time_hours, test_datetime)
         
-        # Should use off-peak rate (0.139 RM/kWh)
-        expected_cost = 10.0 * 1.0 * 0.139  # 1.39 RM
-        self.assertAlmostEqual(cost_info['cost'], expected_cost, places=3)
+        # Should use off-peak rate (0.139 RM/kWh); integer tenths of a
+        # cent, matching the peak-rate test
+        self.assertEqual(int(round(cost_info['cost'] * 1000)), 1390)  # 1.39 RM
         self.assertEqual(cost_info['rate_type'], 'Off-Peak')
         self.assertEqual(cost_info['rate_used'], 0.139)
 
@@ -121,13 +123,15 @@ class TestPeakStatusFunctionality(unittest.TestCase):
             (22, 1, False, "10:01 PM should be off-peak"),
         ]
         
-        for hour, minute, expected_peak, message in test_cases:
-            test_datetime = datetime(2020, 1, 1, hour, minute, 0)
-            is_peak = (
-                test_datetime.hour >= self.peak_start_hour
-                and test_datetime.hour < self.peak_end_hour
-            )
-            self.assertEqual(is_peak, expected_peak, message)
+        # Only the hour matters to the classification; compare all cases
+        # in one vectorized assertion instead of one assertEqual each
+        hours = np.array([hour for hour, _, _, _ in test_cases])
+        expected = np.array([expected for _, _, expected, _ in test_cases])
+        is_peak = (hours >= self.peak_start_hour) & (hours < self.peak_end_hour)
+        mismatches = [
+            test_cases[i][3] for i in np.flatnonzero(is_peak != expected)
+        ]
+        self.assertEqual(mismatches, [])
 
     def test_peak_status_data_structure(self):
         """Test that peak status data structure is correct."""
@@ -159,17 +163,15 @@ class TestPeakStatusFunctionality(unittest.TestCase):
 
     def test_all_hours_classification(self):
         """Test peak classification for all 24 hours."""
-        for hour in range(24):
-            test_datetime = datetime(2020, 1, 1, hour, 0, 0)
-            is_peak = (
-                test_datetime.hour >= self.peak_start_hour
-                and test_datetime.hour < self.peak_end_hour
-            )
-            
-            if 8 <= hour < 22:
-                self.assertTrue(is_peak, f"Hour {hour} should be peak")
-            else:
-                self.assertFalse(is_peak, f"Hour {hour} should be off-peak")
+        # One vectorized comparison over all 24 hours instead of 24
+        # assert calls (only .hour was consumed from the datetimes)
+        hours = np.arange(24)
+        is_peak = (hours >= self.peak_start_hour) & (hours < self.peak_end_hour)
+        expected = (hours >= 8) & (hours < 22)
+        self.assertTrue(
+            np.array_equal(is_peak, expected),
+            f"Misclassified hours: {np.flatnonzero(is_peak != expected).tolist()}",
+        )
 
     def test_peak_status_string_formatting(self):
         """Test peak status string formatting for UI display."""